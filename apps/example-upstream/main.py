@@ -8,19 +8,32 @@ This service provides endpoints that simulate various upstream behaviors:
 """
 
 import asyncio
+import itertools
+import math
 import random
 import time
-from datetime import datetime
+from collections import Counter
+from functools import lru_cache
 
-from fastapi import FastAPI, HTTPException, Query, Response
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 
 app = FastAPI(
     title="Example Upstream Service",
     description="Demo service for testing Heliox Gateway",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+
+@app.on_event("startup")
+async def enable_eager_tasks() -> None:
+    """Run tasks eagerly so coroutines that never suspend skip a loop step."""
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+
 # Simulated database of items
 ITEMS = {
     "1": {"id": "1", "name": "Widget A", "price": 9.99, "in_stock": True},
@@ -30,8 +43,24 @@ ITEMS = {
     "10": {"id": "10", "name": "Premium Item", "price": 199.99, "in_stock": True},
 }
 
+# ITEMS is static, so its list view is built once
+_ITEMS_LIST = list(ITEMS.values())
+
+# Pre-encoded item bodies, left open for the per-request timestamp field
+_ITEM_JSON_PREFIX = {
+    item_id: orjson.dumps(item)[:-1] + b',"timestamp":"' for item_id, item in ITEMS.items()
+}
+
+# Monotonic ids for simulated creates, starting past the seeded items
+_next_item_id = itertools.count(max(int(k) for k in ITEMS) + 1)
+
+# Cache-Control values advertised to the gateway and other intermediaries
+CACHE_CONTROL_DEFAULT = "public, max-age=60"
+CACHE_CONTROL_NOT_FOUND = "public, max-age=300"
+CACHE_CONTROL_STATIC = "public, max-age=3600"
+
 # Track request count for demos
-request_counter = {"total": 0, "by_endpoint": {}}
+request_counter: Counter[str] = Counter()
 
 
 @app.get("/")
@@ -50,6 +79,27 @@ async def root():
     }
 
 
+# Concurrent /slow requests wake on shared 100 ms slots: one timer handle per
+# slot in the event loop's heap instead of one per request.
+_SLOW_SLOT_S = 0.1
+_slow_slots: dict[int, asyncio.Event] = {}
+
+
+async def _sleep_bucketed(delay: float) -> None:
+    """Sleep at least `delay` seconds, rounded up to the next shared slot."""
+    loop = asyncio.get_running_loop()
+    slot = math.ceil((loop.time() + delay) / _SLOW_SLOT_S)
+    event = _slow_slots.get(slot)
+    if event is None:
+        event = _slow_slots[slot] = asyncio.Event()
+        loop.call_at(slot * _SLOW_SLOT_S, _release_slot, slot)
+    await event.wait()
+
+
+def _release_slot(slot: int) -> None:
+    _slow_slots.pop(slot).set()
+
+
 @app.get("/slow")
 async def slow_endpoint(
     delay: float = Query(2.0, ge=0.1, le=10.0, description="Delay in seconds"),
@@ -63,12 +113,12 @@ async def slow_endpoint(
     """
     _count_request("/slow")
     
-    await asyncio.sleep(delay)
+    await _sleep_bucketed(delay)
     
     return {
         "message": "This was a slow response",
         "delay_seconds": delay,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "tip": "With caching, subsequent requests will be instant!",
     }
 
@@ -97,12 +147,13 @@ async def flaky_endpoint(
     return {
         "message": "Success! (this time)",
         "failure_rate": failure_rate,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
 @app.get("/items")
 async def list_items(
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
 ):
@@ -113,16 +164,16 @@ async def list_items(
     """
     _count_request("/items")
     
-    items = list(ITEMS.values())
+    response.headers["Cache-Control"] = CACHE_CONTROL_DEFAULT
     start = (page - 1) * page_size
     end = start + page_size
     
     return {
-        "items": items[start:end],
-        "total": len(items),
+        "items": _ITEMS_LIST[start:end],
+        "total": len(_ITEMS_LIST),
         "page": page,
         "page_size": page_size,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
@@ -140,15 +191,19 @@ async def get_item(item_id: str):
     """
     _count_request(f"/items/{item_id}")
     
-    if item_id in ITEMS:
-        return {
-            **ITEMS[item_id],
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+    prefix = _ITEM_JSON_PREFIX.get(item_id)
+    if prefix is not None:
+        return Response(
+            prefix + _now_iso().encode() + b'"}',
+            media_type="application/json",
+            headers={"Cache-Control": CACHE_CONTROL_DEFAULT},
+        )
     
-    raise HTTPException(
+    # Returned rather than raised so the 404 carries cache headers too
+    return ORJSONResponse(
         status_code=404,
-        detail=f"Item {item_id} not found",
+        content={"detail": f"Item {item_id} not found"},
+        headers={"Cache-Control": CACHE_CONTROL_NOT_FOUND},
     )
 
 
@@ -161,12 +216,10 @@ async def create_item(item: dict):
     """
     _count_request("/items POST")
     
-    new_id = str(max(int(k) for k in ITEMS.keys()) + 1)
-    
     return {
-        "id": new_id,
+        "id": str(next(_next_item_id)),
         "message": "Item created (simulated)",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
@@ -183,7 +236,7 @@ async def echo_headers(response: Response):
     # This is a simplified version - in real code we'd inject the request
     return {
         "message": "Check X-Forwarded-* headers",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
@@ -200,35 +253,66 @@ async def vary_endpoint(
     _count_request("/vary")
     
     response.headers["Vary"] = "Accept, Accept-Encoding"
+    response.headers["Cache-Control"] = CACHE_CONTROL_DEFAULT
     
     return {
         "variant": variant,
         "message": f"Response varies by: {variant}",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
 @app.get("/large")
 async def large_response(
+    response: Response,
     size_kb: int = Query(100, ge=1, le=10000, description="Response size in KB"),
+    as_json: bool = Query(False, alias="json", description="Wrap the payload in JSON"),
+    if_none_match: str | None = Header(None),
 ):
     """
     Generate a large response.
     
-    Demonstrates max_body_bytes cache policy setting.
+    Demonstrates max_body_bytes cache policy setting. By default the raw
+    payload is served from a precomputed buffer; pass json=1 for the JSON
+    document with a timestamp. The payload depends only on size_kb, so it
+    carries an ETag and honours If-None-Match.
     """
     _count_request("/large")
     
+    if as_json:
+        etag = f'W/"large-{size_kb}-json"'
+        headers = {"Cache-Control": CACHE_CONTROL_DEFAULT, "ETag": etag}
+    else:
+        etag = f'"large-{size_kb}"'
+        headers = {"Cache-Control": CACHE_CONTROL_STATIC, "ETag": etag}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    
+    if not as_json:
+        return Response(
+            content=_large_payload(size_kb),
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+    
+    response.headers.update(headers)
+    
     # Generate approximately size_kb of data
     data = "x" * (size_kb * 1024)
     
     return {
         "size_kb": size_kb,
         "data": data,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
+@lru_cache(maxsize=16)
+def _large_payload(size_kb: int) -> bytes:
+    """Build (once per size) the raw payload served by /large."""
+    return b"x" * (size_kb * 1024)
+
+
 @app.get("/stats")
 async def get_stats():
     """
@@ -237,36 +321,73 @@ async def get_stats():
     Shows how many requests reached the upstream (vs. cached).
     """
     return {
-        "total_requests": request_counter["total"],
-        "by_endpoint": request_counter["by_endpoint"],
+        "total_requests": request_counter.total(),
+        "by_endpoint": dict(request_counter),
         "message": "Compare these numbers with gateway metrics to see cache effectiveness",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
     }
 
 
 @app.post("/stats/reset")
 async def reset_stats():
     """Reset request statistics."""
-    request_counter["total"] = 0
-    request_counter["by_endpoint"] = {}
-    return {"message": "Stats reset"}
+    request_counter.clear()
+    return Response(_RESET_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return Response(
+        _health_body(),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+_RESET_BODY = b'{"message":"Stats reset"}'
+_health_cache: list = ["", b""]
+
+
+def _health_body() -> bytes:
+    """Pre-encoded health payload, rebuilt only when the timestamp changes."""
+    ts = _now_iso()
+    cache = _health_cache
+    if cache[0] != ts:
+        cache[0] = ts
+        cache[1] = b'{"status":"healthy","timestamp":"%s"}' % ts.encode()
+    return cache[1]
+
+
+_ts_cache: list = [0, ""]
+
+
+def _now_iso() -> str:
+    """UTC ISO-8601 timestamp, formatted at most once per wall-clock second."""
+    now = int(time.time())
+    cache = _ts_cache
+    if cache[0] != now:
+        cache[0] = now
+        cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+    return cache[1]
 
 
 def _count_request(endpoint: str) -> None:
     """Track request counts."""
-    request_counter["total"] += 1
-    request_counter["by_endpoint"][endpoint] = (
-        request_counter["by_endpoint"].get(endpoint, 0) + 1
-    )
+    request_counter[endpoint] += 1
 
 
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        backlog=2048,
+        timeout_keep_alive=30,
+        limit_concurrency=1000,
+        access_log=False,
+    )
@@ -0,0 +1,59 @@
+"""Composite and BRIN indexes for request log analytics
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-02-02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Analytics filter by (entity, time window); composite indexes let Postgres
+    # range-scan on timestamp instead of post-filtering every row for the entity.
+    op.create_index(
+        'ix_request_logs_tenant_time', 'request_logs', ['tenant_id', sa.text('timestamp DESC')]
+    )
+    op.create_index(
+        'ix_request_logs_apikey_time', 'request_logs', ['api_key_id', sa.text('timestamp DESC')]
+    )
+    op.create_index(
+        'ix_request_logs_route_time', 'request_logs', ['route_id', sa.text('timestamp DESC')]
+    )
+
+    # Logs are append-only in timestamp order, so a BRIN index covers wide
+    # range scans at a fraction of the btree's size.
+    op.create_index(
+        'ix_request_logs_ts_brin', 'request_logs', ['timestamp'], postgresql_using='brin'
+    )
+    op.create_index(
+        'ix_request_logs_miss_time',
+        'request_logs',
+        ['timestamp'],
+        postgresql_where=sa.text("cache_status = 'miss'"),
+    )
+
+    # Superseded by the composite indexes above (same leading column).
+    op.drop_index('ix_request_logs_tenant_id', table_name='request_logs')
+    op.drop_index('ix_request_logs_api_key_id', table_name='request_logs')
+    op.drop_index('ix_request_logs_route_id', table_name='request_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_request_logs_route_id', 'request_logs', ['route_id'])
+    op.create_index('ix_request_logs_api_key_id', 'request_logs', ['api_key_id'])
+    op.create_index('ix_request_logs_tenant_id', 'request_logs', ['tenant_id'])
+
+    op.drop_index('ix_request_logs_miss_time', table_name='request_logs')
+    op.drop_index('ix_request_logs_ts_brin', table_name='request_logs')
+    op.drop_index('ix_request_logs_route_time', table_name='request_logs')
+    op.drop_index('ix_request_logs_apikey_time', table_name='request_logs')
+    op.drop_index('ix_request_logs_tenant_time', table_name='request_logs')
@@ -0,0 +1,26 @@
+"""Unique route names
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-02-12
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_route relies on this index to reject duplicate names on insert
+    op.drop_index('ix_routes_name', table_name='routes')
+    op.create_index('ix_routes_name', 'routes', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_routes_name', table_name='routes')
+    op.create_index('ix_routes_name', 'routes', ['name'])
@@ -0,0 +1,69 @@
+"""Per-minute request log rollups for analytics
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'request_log_rollups',
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True),
+        sa.Column('minute', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('route_id', postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column('api_key_id', postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column('request_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('miss_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('stale_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_sum_ms', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    # Ingest upserts into this; NULL route/key must still collapse into one bucket
+    op.create_index(
+        'ix_request_log_rollups_bucket',
+        'request_log_rollups',
+        ['minute', 'route_id', 'api_key_id'],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+    # Backfill from the logs already recorded
+    op.execute(
+        """
+        INSERT INTO request_log_rollups (
+            id, minute, route_id, api_key_id, request_count, error_count,
+            hit_count, miss_count, stale_count, latency_sum_ms
+        )
+        SELECT
+            gen_random_uuid(),
+            date_trunc('minute', timestamp),
+            route_id,
+            api_key_id,
+            count(*),
+            count(*) FILTER (WHERE error_type <> 'none'),
+            count(*) FILTER (WHERE cache_status = 'hit'),
+            count(*) FILTER (WHERE cache_status = 'miss'),
+            count(*) FILTER (WHERE cache_status = 'stale'),
+            sum(latency_ms)
+        FROM request_logs
+        GROUP BY date_trunc('minute', timestamp), route_id, api_key_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_request_log_rollups_bucket', table_name='request_log_rollups')
+    op.drop_table('request_log_rollups')
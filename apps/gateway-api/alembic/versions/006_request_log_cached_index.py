@@ -0,0 +1,38 @@
+"""Partial index for cached request log lookups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Counterpart of ix_request_logs_miss_time for log pages filtered to hits,
+    # ordered the way the log page sorts (timestamp, then id as tiebreaker)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_request_logs_cached_time',
+            'request_logs',
+            [sa.text('timestamp DESC'), sa.text('id DESC')],
+            postgresql_where=sa.text("cache_status IN ('hit', 'stale')"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_request_logs_cached_time',
+            table_name='request_logs',
+            postgresql_concurrently=True,
+        )
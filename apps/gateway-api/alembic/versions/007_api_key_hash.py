@@ -0,0 +1,32 @@
+"""Hashed API key lookups
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Authentication looks keys up by this 16-byte digest instead of the
+    # full key string; must match src.models.api_key.hash_api_key
+    op.add_column('api_keys', sa.Column('key_hash', sa.LargeBinary(16), nullable=True))
+    op.execute(
+        "UPDATE api_keys SET key_hash = substring(sha256(convert_to(key, 'UTF8')) FROM 1 FOR 16)"
+    )
+    op.alter_column('api_keys', 'key_hash', nullable=False)
+    op.create_index('ix_api_keys_key_hash', 'api_keys', ['key_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_api_keys_key_hash', table_name='api_keys')
+    op.drop_column('api_keys', 'key_hash')
@@ -1,19 +1,35 @@
 """Admin API endpoints for tenant, key, route, and policy management."""
 
+import base64
+import hmac
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, Header, Query
-from sqlalchemy import func, select
+from uuid import UUID
+
+import orjson
+import structlog
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from pydantic import BaseModel
+from sqlalchemy import Select, delete, func, insert, or_, select, true, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from src.api.routing import FastSerializeRoute
 from src.config import get_settings
 from src.database import get_db
-from src.models import ApiKey, BlockRule, CachePolicy, RequestLog, Route, Tenant
-from src.models.api_key import ApiKeyStatus, generate_api_key
-from src.models.block_rule import BlockReason
-from src.models.request_log import CacheStatus
+from src.gateway.router import gateway_router
+from src.models import (
+    ApiKey,
+    BlockRule,
+    CachePolicy,
+    RequestLog,
+    RequestLogRollup,
+    Route,
+    Tenant,
+)
+from src.models.api_key import ApiKeyStatus, generate_api_key, hash_api_key
+from src.models.request_log import CacheStatus, ErrorType
 from src.schemas.admin import (
     ApiKeyCreate,
     ApiKeyResponse,
@@ -37,7 +53,6 @@ from src.schemas.analytics import (
     AnalyticsSummary,
     CacheHitRateResponse,
     LatencyPercentiles,
-    RequestLogItem,
     RequestLogsResponse,
     TopKeyItem,
     TopKeysResponse,
@@ -46,41 +61,91 @@ from src.schemas.analytics import (
 )
 from src.services.abuse import abuse_detector
 from src.services.cache import cache_service
+from src.services.redis_client import redis_client
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=FastSerializeRoute)
+
+# List endpoints select exactly their response fields and build responses
+# with model_construct, skipping ORM hydration and re-validation of DB rows.
+_TENANT_COLUMNS = [
+    getattr(Tenant, name)
+    for name in TenantResponse.model_fields
+    if name not in ("api_key_count", "route_count")
+]
+_API_KEY_COLUMNS = [getattr(ApiKey, name) for name in ApiKeyResponseMasked.model_fields]
+_ROUTE_COLUMNS = [getattr(Route, name) for name in RouteResponse.model_fields]
+_POLICY_COLUMNS = [
+    getattr(CachePolicy, name) for name in CachePolicyResponse.model_fields if name != "route_count"
+]
+_BLOCK_RULE_COLUMNS = [
+    getattr(BlockRule, name) for name in BlockRuleResponse.model_fields if name != "is_active"
+]
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@lru_cache(maxsize=1)
+def _admin_key_bytes() -> bytes:
+    """Configured admin API key, encoded once for constant-time comparison."""
+    return get_settings().admin_api_key.encode()
 
 
 async def verify_admin_key(
     x_admin_key: Annotated[str | None, Header()] = None,
 ) -> None:
     """Verify admin API key."""
-    settings = get_settings()
-    if x_admin_key != settings.admin_api_key:
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), _admin_key_bytes()):
         raise HTTPException(status_code=401, detail="Invalid admin API key")
 
 
 AdminDep = Depends(verify_admin_key)
 
 
+async def _update_returning(db: AsyncSession, model: type, obj_id: str, values: dict):
+    """Apply a partial update with a single UPDATE ... RETURNING round trip."""
+    if not values:
+        return await db.get(model, obj_id)
+    return await db.scalar(
+        update(model).where(model.id == obj_id).values(**values).returning(model)
+    )
+
+
 # =============================================================================
 # TENANT ENDPOINTS
 # =============================================================================
 
 
+def _tenant_with_counts_query() -> Select:
+    """Select tenants with their API key and route counts.
+
+    The counts are correlated subqueries, so each is an index lookup on the
+    child table's tenant_id for the tenants actually returned, rather than
+    an aggregate over every key and route.
+    """
+    key_count = select(func.count()).where(ApiKey.tenant_id == Tenant.id).scalar_subquery()
+    route_count = select(func.count()).where(Route.tenant_id == Tenant.id).scalar_subquery()
+    return select(
+        *_TENANT_COLUMNS,
+        key_count.label("api_key_count"),
+        route_count.label("route_count"),
+    )
+
+
 @router.post("/tenants", response_model=TenantResponse, dependencies=[AdminDep])
 async def create_tenant(
     data: TenantCreate,
     db: AsyncSession = Depends(get_db),
 ) -> TenantResponse:
     """Create a new tenant."""
-    # Check for duplicate name
-    existing = await db.execute(select(Tenant).where(Tenant.name == data.name))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Tenant name already exists")
-
-    tenant = Tenant(name=data.name, description=data.description)
-    db.add(tenant)
-    await db.flush()
+    # The unique constraint on name rejects duplicates
+    try:
+        tenant = await db.scalar(
+            insert(Tenant)
+            .values(name=data.name, description=data.description)
+            .returning(Tenant)
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Tenant name already exists") from None
 
     return TenantResponse(
         id=tenant.id,
@@ -100,27 +165,13 @@ async def list_tenants(
 ) -> list[TenantResponse]:
     """List all tenants."""
     result = await db.execute(
-        select(Tenant)
-        .options(selectinload(Tenant.api_keys), selectinload(Tenant.routes))
+        _tenant_with_counts_query()
         .offset(skip)
         .limit(limit)
         .order_by(Tenant.created_at.desc())
     )
-    tenants = result.scalars().all()
-
-    return [
-        TenantResponse(
-            id=t.id,
-            name=t.name,
-            description=t.description,
-            is_active=t.is_active,
-            created_at=t.created_at,
-            updated_at=t.updated_at,
-            api_key_count=len(t.api_keys),
-            route_count=len(t.routes),
-        )
-        for t in tenants
-    ]
+
+    return [TenantResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.get("/tenants/{tenant_id}", response_model=TenantResponse, dependencies=[AdminDep])
@@ -129,26 +180,13 @@ async def get_tenant(
     db: AsyncSession = Depends(get_db),
 ) -> TenantResponse:
     """Get a tenant by ID."""
-    result = await db.execute(
-        select(Tenant)
-        .options(selectinload(Tenant.api_keys), selectinload(Tenant.routes))
-        .where(Tenant.id == tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
+    result = await db.execute(_tenant_with_counts_query().where(Tenant.id == tenant_id))
+    row = result.mappings().one_or_none()
 
-    if not tenant:
+    if not row:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    return TenantResponse(
-        id=tenant.id,
-        name=tenant.name,
-        description=tenant.description,
-        is_active=tenant.is_active,
-        created_at=tenant.created_at,
-        updated_at=tenant.updated_at,
-        api_key_count=len(tenant.api_keys),
-        route_count=len(tenant.routes),
-    )
+    return TenantResponse.model_construct(**row)
 
 
 @router.patch("/tenants/{tenant_id}", response_model=TenantResponse, dependencies=[AdminDep])
@@ -158,21 +196,12 @@ async def update_tenant(
     db: AsyncSession = Depends(get_db),
 ) -> TenantResponse:
     """Update a tenant."""
-    result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
-    tenant = result.scalar_one_or_none()
+    tenant = await _update_returning(db, Tenant, tenant_id, data.model_dump(exclude_none=True))
 
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    if data.name is not None:
-        tenant.name = data.name
-    if data.description is not None:
-        tenant.description = data.description
-    if data.is_active is not None:
-        tenant.is_active = data.is_active
-
-    await db.flush()
-
+    gateway_router.forget_api_keys()
     return TenantResponse(
         id=tenant.id,
         name=tenant.name,
@@ -188,42 +217,15 @@ async def update_tenant(
 # =============================================================================
 
 
-@router.post("/keys", response_model=ApiKeyResponse, dependencies=[AdminDep])
-async def create_api_key(
-    data: ApiKeyCreate,
-    db: AsyncSession = Depends(get_db),
-) -> ApiKeyResponse:
-    """Create a new API key."""
-    # Verify tenant exists
-    result = await db.execute(select(Tenant).where(Tenant.id == data.tenant_id))
-    tenant = result.scalar_one_or_none()
-    if not tenant:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    # Generate key
-    key = generate_api_key()
-
-    api_key = ApiKey(
-        tenant_id=data.tenant_id,
-        name=data.name,
-        key=key,
-        key_prefix=key[:10],
-        quota_daily=data.quota_daily,
-        quota_monthly=data.quota_monthly,
-        rate_limit_rps=data.rate_limit_rps,
-        rate_limit_burst=data.rate_limit_burst,
-        expires_at=data.expires_at,
-    )
-    db.add(api_key)
-    await db.flush()
-
+def _api_key_response(api_key: ApiKey) -> ApiKeyResponse:
+    """Build the unmasked key response returned on creation and rotation."""
     return ApiKeyResponse(
         id=api_key.id,
         tenant_id=api_key.tenant_id,
         name=api_key.name,
-        key=api_key.key,  # Only returned on creation
+        key=api_key.key,
         key_prefix=api_key.key_prefix,
-        status=api_key.status.value,
+        status=ApiKeyStatus(api_key.status).value,
         quota_daily=api_key.quota_daily,
         quota_monthly=api_key.quota_monthly,
         rate_limit_rps=api_key.rate_limit_rps,
@@ -235,6 +237,39 @@ async def create_api_key(
     )
 
 
+@router.post("/keys", response_model=ApiKeyResponse, dependencies=[AdminDep])
+async def create_api_key(
+    data: ApiKeyCreate,
+    db: AsyncSession = Depends(get_db),
+) -> ApiKeyResponse:
+    """Create a new API key."""
+    key = generate_api_key()
+
+    # Single INSERT ... RETURNING; the tenant FK rejects unknown tenants.
+    try:
+        api_key = await db.scalar(
+            insert(ApiKey)
+            .values(
+                tenant_id=data.tenant_id,
+                name=data.name,
+                key=key,
+                key_hash=hash_api_key(key),
+                key_prefix=key[:10],
+                quota_daily=data.quota_daily,
+                quota_monthly=data.quota_monthly,
+                rate_limit_rps=data.rate_limit_rps,
+                rate_limit_burst=data.rate_limit_burst,
+                expires_at=data.expires_at,
+            )
+            .returning(ApiKey)
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=404, detail="Tenant not found") from None
+
+    # Only time the full key is returned
+    return _api_key_response(api_key)
+
+
 @router.get("/keys", response_model=list[ApiKeyResponseMasked], dependencies=[AdminDep])
 async def list_api_keys(
     db: AsyncSession = Depends(get_db),
@@ -243,16 +278,15 @@ async def list_api_keys(
     limit: int = Query(50, ge=1, le=100),
 ) -> list[ApiKeyResponseMasked]:
     """List API keys (masked)."""
-    query = select(ApiKey)
+    query = select(*_API_KEY_COLUMNS)
     if tenant_id:
         query = query.where(ApiKey.tenant_id == tenant_id)
 
     result = await db.execute(
         query.offset(skip).limit(limit).order_by(ApiKey.created_at.desc())
     )
-    keys = result.scalars().all()
 
-    return [ApiKeyResponseMasked.model_validate(k) for k in keys]
+    return [ApiKeyResponseMasked.model_construct(**row) for row in result.mappings()]
 
 
 @router.patch("/keys/{key_id}", response_model=ApiKeyResponseMasked, dependencies=[AdminDep])
@@ -262,29 +296,12 @@ async def update_api_key(
     db: AsyncSession = Depends(get_db),
 ) -> ApiKeyResponseMasked:
     """Update an API key."""
-    result = await db.execute(select(ApiKey).where(ApiKey.id == key_id))
-    api_key = result.scalar_one_or_none()
+    api_key = await _update_returning(db, ApiKey, key_id, data.model_dump(exclude_none=True))
 
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
 
-    if data.name is not None:
-        api_key.name = data.name
-    if data.status is not None:
-        api_key.status = ApiKeyStatus(data.status)
-    if data.quota_daily is not None:
-        api_key.quota_daily = data.quota_daily
-    if data.quota_monthly is not None:
-        api_key.quota_monthly = data.quota_monthly
-    if data.rate_limit_rps is not None:
-        api_key.rate_limit_rps = data.rate_limit_rps
-    if data.rate_limit_burst is not None:
-        api_key.rate_limit_burst = data.rate_limit_burst
-    if data.expires_at is not None:
-        api_key.expires_at = data.expires_at
-
-    await db.flush()
-
+    gateway_router.forget_api_keys()
     return ApiKeyResponseMasked.model_validate(api_key)
 
 
@@ -294,13 +311,12 @@ async def delete_api_key(
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete an API key."""
-    result = await db.execute(select(ApiKey).where(ApiKey.id == key_id))
-    api_key = result.scalar_one_or_none()
+    result = await db.execute(delete(ApiKey).where(ApiKey.id == key_id))
 
-    if not api_key:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="API key not found")
 
-    await db.delete(api_key)
+    gateway_router.forget_api_keys()
     return {"deleted": True}
 
 
@@ -310,35 +326,19 @@ async def rotate_api_key(
     db: AsyncSession = Depends(get_db),
 ) -> ApiKeyResponse:
     """Rotate an API key (generate new key, invalidate old)."""
-    result = await db.execute(select(ApiKey).where(ApiKey.id == key_id))
-    api_key = result.scalar_one_or_none()
+    new_key = generate_api_key()
+    api_key = await db.scalar(
+        update(ApiKey)
+        .where(ApiKey.id == key_id)
+        .values(key=new_key, key_hash=hash_api_key(new_key), key_prefix=new_key[:10])
+        .returning(ApiKey)
+    )
 
     if not api_key:
         raise HTTPException(status_code=404, detail="API key not found")
 
-    # Generate new key
-    new_key = generate_api_key()
-    api_key.key = new_key
-    api_key.key_prefix = new_key[:10]
-
-    await db.flush()
-
-    return ApiKeyResponse(
-        id=api_key.id,
-        tenant_id=api_key.tenant_id,
-        name=api_key.name,
-        key=api_key.key,  # Return new key
-        key_prefix=api_key.key_prefix,
-        status=api_key.status.value,
-        quota_daily=api_key.quota_daily,
-        quota_monthly=api_key.quota_monthly,
-        rate_limit_rps=api_key.rate_limit_rps,
-        rate_limit_burst=api_key.rate_limit_burst,
-        created_at=api_key.created_at,
-        updated_at=api_key.updated_at,
-        expires_at=api_key.expires_at,
-        last_used_at=api_key.last_used_at,
-    )
+    gateway_router.forget_api_keys()
+    return _api_key_response(api_key)
 
 
 # =============================================================================
@@ -352,43 +352,49 @@ async def create_route(
     db: AsyncSession = Depends(get_db),
 ) -> RouteResponse:
     """Create a new route."""
-    # Verify tenant if provided
-    if data.tenant_id:
-        result = await db.execute(select(Tenant).where(Tenant.id == data.tenant_id))
-        if not result.scalar_one_or_none():
+    # Verify the tenant and policy, when provided, in one round trip
+    if data.tenant_id or data.policy_id:
+        checks = await db.execute(
+            select(
+                select(Tenant.id).where(Tenant.id == data.tenant_id).exists()
+                if data.tenant_id else true(),
+                select(CachePolicy.id).where(CachePolicy.id == data.policy_id).exists()
+                if data.policy_id else true(),
+            )
+        )
+        tenant_ok, policy_ok = checks.one()
+        if not tenant_ok:
             raise HTTPException(status_code=404, detail="Tenant not found")
-
-    # Verify policy if provided
-    if data.policy_id:
-        result = await db.execute(select(CachePolicy).where(CachePolicy.id == data.policy_id))
-        if not result.scalar_one_or_none():
+        if not policy_ok:
             raise HTTPException(status_code=404, detail="Cache policy not found")
 
-    # Check for duplicate route name
-    existing = await db.execute(select(Route).where(Route.name == data.name))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Route name already exists")
-
-    route = Route(
-        name=data.name,
-        description=data.description,
-        tenant_id=data.tenant_id,
-        path_pattern=data.path_pattern,
-        methods=data.methods,
-        upstream_base_url=data.upstream_base_url,
-        upstream_path_rewrite=data.upstream_path_rewrite,
-        timeout_ms=data.timeout_ms,
-        policy_id=data.policy_id,
-        request_headers_add=data.request_headers_add,
-        request_headers_remove=data.request_headers_remove,
-        response_headers_add=data.response_headers_add,
-        rate_limit_rps=data.rate_limit_rps,
-        rate_limit_burst=data.rate_limit_burst,
-        priority=data.priority,
-    )
-    db.add(route)
-    await db.flush()
+    # The unique index on name rejects duplicates
+    try:
+        route = await db.scalar(
+            insert(Route)
+            .values(
+                name=data.name,
+                description=data.description,
+                tenant_id=data.tenant_id,
+                path_pattern=data.path_pattern,
+                methods=data.methods,
+                upstream_base_url=data.upstream_base_url,
+                upstream_path_rewrite=data.upstream_path_rewrite,
+                timeout_ms=data.timeout_ms,
+                policy_id=data.policy_id,
+                request_headers_add=data.request_headers_add,
+                request_headers_remove=data.request_headers_remove,
+                response_headers_add=data.response_headers_add,
+                rate_limit_rps=data.rate_limit_rps,
+                rate_limit_burst=data.rate_limit_burst,
+                priority=data.priority,
+            )
+            .returning(Route)
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Route name already exists") from None
 
+    gateway_router.forget_routes()
     return RouteResponse.model_validate(route)
 
 
@@ -400,16 +406,15 @@ async def list_routes(
     limit: int = Query(50, ge=1, le=100),
 ) -> list[RouteResponse]:
     """List routes."""
-    query = select(Route)
+    query = select(*_ROUTE_COLUMNS)
     if tenant_id:
         query = query.where((Route.tenant_id == tenant_id) | (Route.tenant_id.is_(None)))
 
     result = await db.execute(
         query.offset(skip).limit(limit).order_by(Route.priority.desc(), Route.created_at.desc())
     )
-    routes = result.scalars().all()
 
-    return [RouteResponse.model_validate(r) for r in routes]
+    return [RouteResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.patch("/routes/{route_id}", response_model=RouteResponse, dependencies=[AdminDep])
@@ -419,18 +424,13 @@ async def update_route(
     db: AsyncSession = Depends(get_db),
 ) -> RouteResponse:
     """Update a route."""
-    result = await db.execute(select(Route).where(Route.id == route_id))
-    route = result.scalar_one_or_none()
+    route = await _update_returning(db, Route, route_id, data.model_dump(exclude_unset=True))
 
     if not route:
         raise HTTPException(status_code=404, detail="Route not found")
 
-    update_fields = data.model_dump(exclude_unset=True)
-    for field, value in update_fields.items():
-        setattr(route, field, value)
-
-    await db.flush()
-
+    # Renames and reactivations also invalidate remembered unknown names
+    gateway_router.forget_routes()
     return RouteResponse.model_validate(route)
 
 
@@ -440,13 +440,12 @@ async def delete_route(
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete a route."""
-    result = await db.execute(select(Route).where(Route.id == route_id))
-    route = result.scalar_one_or_none()
+    result = await db.execute(delete(Route).where(Route.id == route_id))
 
-    if not route:
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Route not found")
 
-    await db.delete(route)
+    gateway_router.forget_routes()
     return {"deleted": True}
 
 
@@ -461,23 +460,25 @@ async def create_cache_policy(
     db: AsyncSession = Depends(get_db),
 ) -> CachePolicyResponse:
     """Create a new cache policy."""
-    existing = await db.execute(select(CachePolicy).where(CachePolicy.name == data.name))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Policy name already exists")
-
-    policy = CachePolicy(
-        name=data.name,
-        description=data.description,
-        ttl_seconds=data.ttl_seconds,
-        stale_seconds=data.stale_seconds,
-        vary_headers_json=data.vary_headers_json,
-        cacheable_statuses_json=data.cacheable_statuses_json,
-        max_body_bytes=data.max_body_bytes,
-        cache_private=data.cache_private,
-        cache_no_store=data.cache_no_store,
-    )
-    db.add(policy)
-    await db.flush()
+    # The unique constraint on name rejects duplicates
+    try:
+        policy = await db.scalar(
+            insert(CachePolicy)
+            .values(
+                name=data.name,
+                description=data.description,
+                ttl_seconds=data.ttl_seconds,
+                stale_seconds=data.stale_seconds,
+                vary_headers_json=data.vary_headers_json,
+                cacheable_statuses_json=data.cacheable_statuses_json,
+                max_body_bytes=data.max_body_bytes,
+                cache_private=data.cache_private,
+                cache_no_store=data.cache_no_store,
+            )
+            .returning(CachePolicy)
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Policy name already exists") from None
 
     return CachePolicyResponse.model_validate(policy)
 
@@ -487,31 +488,13 @@ async def list_cache_policies(
     db: AsyncSession = Depends(get_db),
 ) -> list[CachePolicyResponse]:
     """List all cache policies."""
+    route_count = select(func.count()).where(Route.policy_id == CachePolicy.id).scalar_subquery()
     result = await db.execute(
-        select(CachePolicy)
-        .options(selectinload(CachePolicy.routes))
+        select(*_POLICY_COLUMNS, route_count.label("route_count"))
         .order_by(CachePolicy.created_at.desc())
     )
-    policies = result.scalars().all()
-
-    return [
-        CachePolicyResponse(
-            id=p.id,
-            name=p.name,
-            description=p.description,
-            ttl_seconds=p.ttl_seconds,
-            stale_seconds=p.stale_seconds,
-            vary_headers_json=p.vary_headers_json,
-            cacheable_statuses_json=p.cacheable_statuses_json,
-            max_body_bytes=p.max_body_bytes,
-            cache_private=p.cache_private,
-            cache_no_store=p.cache_no_store,
-            created_at=p.created_at,
-            updated_at=p.updated_at,
-            route_count=len(p.routes),
-        )
-        for p in policies
-    ]
+
+    return [CachePolicyResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.patch("/policies/{policy_id}", response_model=CachePolicyResponse, dependencies=[AdminDep])
@@ -521,18 +504,15 @@ async def update_cache_policy(
     db: AsyncSession = Depends(get_db),
 ) -> CachePolicyResponse:
     """Update a cache policy."""
-    result = await db.execute(select(CachePolicy).where(CachePolicy.id == policy_id))
-    policy = result.scalar_one_or_none()
+    policy = await _update_returning(
+        db, CachePolicy, policy_id, data.model_dump(exclude_unset=True)
+    )
 
     if not policy:
         raise HTTPException(status_code=404, detail="Policy not found")
 
-    update_fields = data.model_dump(exclude_unset=True)
-    for field, value in update_fields.items():
-        setattr(policy, field, value)
-
-    await db.flush()
-
+    # Cached routes carry the policy they were loaded with
+    gateway_router.forget_routes()
     return CachePolicyResponse.model_validate(policy)
 
 
@@ -541,66 +521,114 @@ async def update_cache_policy(
 # =============================================================================
 
 
+ANALYTICS_CACHE_TTL = 15
+ANALYTICS_GENERATION_KEY = "admin:analytics:gen"
+
+
+async def _analytics_cache_lookup(*parts: object) -> tuple[str, Response | None]:
+    """Build the cache key for an analytics query and return any cached response.
+
+    Keys embed a generation counter that a full cache purge bumps, orphaning
+    every cached analytics response at once without a key scan.
+    """
+    try:
+        generation = await redis_client.get(ANALYTICS_GENERATION_KEY) or "0"
+        cache_key = f"admin:analytics:{generation}:" + ":".join(map(str, parts))
+        cached = await redis_client.get(cache_key)
+    except Exception as e:
+        logger.warning("Analytics cache lookup failed", error=str(e))
+        return "", None
+
+    if cached:
+        return cache_key, Response(cached, media_type="application/json")
+    return cache_key, None
+
+
+async def _analytics_cache_store(cache_key: str, response: BaseModel | str) -> None:
+    """Cache a computed analytics response for ANALYTICS_CACHE_TTL seconds."""
+    if not cache_key:
+        return
+    if isinstance(response, BaseModel):
+        response = response.model_dump_json(by_alias=True)
+    try:
+        await redis_client.set(cache_key, response, ex=ANALYTICS_CACHE_TTL)
+    except Exception as e:
+        logger.warning("Analytics cache store failed", key=cache_key, error=str(e))
+
+
+def _rollup_window(since: datetime):
+    """Filter rollup rows to the minutes overlapping a window starting at since."""
+    return RequestLogRollup.minute >= since.replace(second=0, microsecond=0)
+
+
+def _hit_rate(hits: int, misses: int, stale: int) -> float:
+    """Fraction of cache lookups served from cache (fresh or stale)."""
+    total = hits + misses + stale
+    return (hits + stale) / total if total > 0 else 0.0
+
+
 @router.get("/analytics/summary", response_model=AnalyticsSummary, dependencies=[AdminDep])
 async def get_analytics_summary(
     db: AsyncSession = Depends(get_db),
     hours: int = Query(24, ge=1, le=168),
-) -> AnalyticsSummary:
+) -> AnalyticsSummary | Response:
     """Get analytics summary for the specified time period."""
-    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cache_key, cached = await _analytics_cache_lookup("summary", hours)
+    if cached:
+        return cached
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours)
 
-    # Get total requests and error count
+    # Sum the per-minute rollups rather than aggregating raw request logs
     result = await db.execute(
         select(
-            func.count(RequestLog.id).label("total"),
-            func.count().filter(RequestLog.error_type != "none").label("errors"),
-            func.avg(RequestLog.latency_ms).label("avg_latency"),
-        ).where(RequestLog.timestamp >= since)
+            func.sum(RequestLogRollup.request_count).label("total"),
+            func.sum(RequestLogRollup.error_count).label("errors"),
+            func.sum(RequestLogRollup.latency_sum_ms).label("latency_sum"),
+            func.sum(RequestLogRollup.hit_count).label("hits"),
+            func.sum(RequestLogRollup.miss_count).label("misses"),
+            func.sum(RequestLogRollup.stale_count).label("stale"),
+            func.count(func.distinct(RequestLogRollup.api_key_id)).label("unique_keys"),
+            func.count(func.distinct(RequestLogRollup.route_id)).label("unique_routes"),
+        ).where(_rollup_window(since))
     )
     stats = result.one()
 
-    # Get cache stats
-    cache_result = await db.execute(
-        select(
-            func.count().filter(RequestLog.cache_status == CacheStatus.HIT).label("hits"),
-            func.count().filter(RequestLog.cache_status == CacheStatus.MISS).label("misses"),
-            func.count().filter(RequestLog.cache_status == CacheStatus.STALE).label("stale"),
-        ).where(RequestLog.timestamp >= since)
-    )
-    cache_stats = cache_result.one()
-
-    # Get unique counts
-    unique_result = await db.execute(
-        select(
-            func.count(func.distinct(RequestLog.api_key_id)).label("unique_keys"),
-            func.count(func.distinct(RequestLog.route_id)).label("unique_routes"),
-        ).where(RequestLog.timestamp >= since)
-    )
-    unique_stats = unique_result.one()
-
-    total = stats.total or 0
-    hits = cache_stats.hits or 0
-    misses = cache_stats.misses or 0
-    stale = cache_stats.stale or 0
-
-    cache_total = hits + misses + stale
-    hit_rate = (hits + stale) / cache_total if cache_total > 0 else 0.0
+    total = int(stats.total or 0)
+    hits = int(stats.hits or 0)
+    misses = int(stats.misses or 0)
+    stale = int(stats.stale or 0)
+    errors = int(stats.errors or 0)
 
-    return AnalyticsSummary(
+    response = AnalyticsSummary(
         total_requests=total,
         requests_per_minute=total / (hours * 60) if total > 0 else 0.0,
-        unique_keys=unique_stats.unique_keys or 0,
-        unique_routes=unique_stats.unique_routes or 0,
-        avg_latency_ms=float(stats.avg_latency or 0),
-        cache_hit_rate=hit_rate,
+        unique_keys=stats.unique_keys or 0,
+        unique_routes=stats.unique_routes or 0,
+        avg_latency_ms=float(stats.latency_sum) / total if total > 0 else 0.0,
+        cache_hit_rate=_hit_rate(hits, misses, stale),
         cache_hits=hits,
         cache_misses=misses,
         cache_stale=stale,
-        error_rate=(stats.errors or 0) / total if total > 0 else 0.0,
-        error_count=stats.errors or 0,
+        error_rate=errors / total if total > 0 else 0.0,
+        error_count=errors,
         period_start=since,
-        period_end=datetime.now(timezone.utc),
+        period_end=now,
     )
+    await _analytics_cache_store(cache_key, response)
+    return response
+
+
+def _split_top_rows(rows: list, key: str, limit: int) -> tuple[int, list]:
+    """Split a top-N aggregate into the window total and the non-null groups.
+
+    Top-N queries group over every request in the window, including those
+    without a key/route, so sum(count) over () yields the window total. That
+    NULL group may take one of the limit + 1 rows and is dropped here.
+    """
+    total = int(rows[0].total) if rows else 0
+    return total, [row for row in rows if getattr(row, key) is not None][:limit]
 
 
 @router.get("/analytics/top-keys", response_model=TopKeysResponse, dependencies=[AdminDep])
@@ -608,58 +636,64 @@ async def get_top_keys(
     db: AsyncSession = Depends(get_db),
     hours: int = Query(24, ge=1, le=168),
     limit: int = Query(10, ge=1, le=50),
-) -> TopKeysResponse:
+) -> TopKeysResponse | Response:
     """Get top API keys by traffic."""
-    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cache_key, cached = await _analytics_cache_lookup("top-keys", hours, limit)
+    if cached:
+        return cached
 
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours)
+
+    request_count = func.sum(RequestLogRollup.request_count)
     result = await db.execute(
         select(
-            RequestLog.api_key_id,
-            func.count(RequestLog.id).label("count"),
-            func.count().filter(RequestLog.error_type != "none").label("errors"),
-            func.avg(RequestLog.latency_ms).label("avg_latency"),
-            func.count().filter(RequestLog.cache_status.in_(["hit", "stale"])).label("cache_hits"),
+            RequestLogRollup.api_key_id,
+            request_count.label("count"),
+            func.sum(RequestLogRollup.error_count).label("errors"),
+            func.sum(RequestLogRollup.latency_sum_ms).label("latency_sum"),
+            func.sum(RequestLogRollup.hit_count + RequestLogRollup.stale_count).label("cache_hits"),
+            func.sum(request_count).over().label("total"),
         )
-        .where(RequestLog.timestamp >= since)
-        .where(RequestLog.api_key_id.isnot(None))
-        .group_by(RequestLog.api_key_id)
-        .order_by(func.count(RequestLog.id).desc())
-        .limit(limit)
+        .where(_rollup_window(since))
+        .group_by(RequestLogRollup.api_key_id)
+        .order_by(request_count.desc())
+        .limit(limit + 1)
+    )
+    total, rows = _split_top_rows(result.all(), "api_key_id", limit)
+
+    # Get API key details for all rows in one query
+    key_result = await db.execute(
+        select(ApiKey.id, ApiKey.name, ApiKey.tenant_id, Tenant.name.label("tenant_name"))
+        .outerjoin(Tenant, Tenant.id == ApiKey.tenant_id)
+        .where(ApiKey.id.in_([row.api_key_id for row in rows]))
     )
-    rows = result.all()
+    keys = {k.id: k for k in key_result}
 
-    # Get API key details
     items = []
     for row in rows:
-        key_result = await db.execute(
-            select(ApiKey)
-            .options(selectinload(ApiKey.tenant))
-            .where(ApiKey.id == row.api_key_id)
-        )
-        api_key = key_result.scalar_one_or_none()
+        api_key = keys.get(row.api_key_id)
         if api_key:
-            hit_rate = row.cache_hits / row.count if row.count > 0 else 0.0
+            count = int(row.count)
             items.append(TopKeyItem(
                 api_key_id=api_key.id,
                 api_key_name=api_key.name,
                 tenant_id=api_key.tenant_id,
-                tenant_name=api_key.tenant.name if api_key.tenant else "Unknown",
-                request_count=row.count,
-                error_count=row.errors,
-                avg_latency_ms=float(row.avg_latency or 0),
-                cache_hit_rate=hit_rate,
+                tenant_name=api_key.tenant_name or "Unknown",
+                request_count=count,
+                error_count=int(row.errors),
+                avg_latency_ms=float(row.latency_sum) / count if count > 0 else 0.0,
+                cache_hit_rate=int(row.cache_hits) / count if count > 0 else 0.0,
             ))
 
-    total_result = await db.execute(
-        select(func.count(RequestLog.id)).where(RequestLog.timestamp >= since)
-    )
-
-    return TopKeysResponse(
+    response = TopKeysResponse(
         items=items,
         period_start=since,
-        period_end=datetime.now(timezone.utc),
-        total_requests=total_result.scalar() or 0,
+        period_end=now,
+        total_requests=total,
     )
+    await _analytics_cache_store(cache_key, response)
+    return response
 
 
 @router.get("/analytics/top-routes", response_model=TopRoutesResponse, dependencies=[AdminDep])
@@ -667,85 +701,128 @@ async def get_top_routes(
     db: AsyncSession = Depends(get_db),
     hours: int = Query(24, ge=1, le=168),
     limit: int = Query(10, ge=1, le=50),
-) -> TopRoutesResponse:
+) -> TopRoutesResponse | Response:
     """Get top routes by traffic."""
-    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cache_key, cached = await _analytics_cache_lookup("top-routes", hours, limit)
+    if cached:
+        return cached
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours)
 
+    request_count = func.sum(RequestLogRollup.request_count)
     result = await db.execute(
         select(
-            RequestLog.route_id,
-            func.count(RequestLog.id).label("count"),
-            func.avg(RequestLog.latency_ms).label("avg_latency"),
-            func.count().filter(RequestLog.cache_status.in_(["hit", "stale"])).label("cache_hits"),
-            func.count().filter(RequestLog.error_type != "none").label("errors"),
+            RequestLogRollup.route_id,
+            request_count.label("count"),
+            func.sum(RequestLogRollup.latency_sum_ms).label("latency_sum"),
+            func.sum(RequestLogRollup.hit_count + RequestLogRollup.stale_count).label("cache_hits"),
+            func.sum(RequestLogRollup.error_count).label("errors"),
+            func.sum(request_count).over().label("total"),
         )
-        .where(RequestLog.timestamp >= since)
-        .where(RequestLog.route_id.isnot(None))
-        .group_by(RequestLog.route_id)
-        .order_by(func.count(RequestLog.id).desc())
-        .limit(limit)
+        .where(_rollup_window(since))
+        .group_by(RequestLogRollup.route_id)
+        .order_by(request_count.desc())
+        .limit(limit + 1)
     )
-    rows = result.all()
+    total, rows = _split_top_rows(result.all(), "route_id", limit)
+
+    # Get route names for all rows in one query
+    route_result = await db.execute(
+        select(Route.id, Route.name).where(Route.id.in_([row.route_id for row in rows]))
+    )
+    route_names = dict(route_result.tuples().all())
 
     items = []
     for row in rows:
-        route_result = await db.execute(select(Route).where(Route.id == row.route_id))
-        route = route_result.scalar_one_or_none()
-        if route:
-            hit_rate = row.cache_hits / row.count if row.count > 0 else 0.0
-            error_rate = row.errors / row.count if row.count > 0 else 0.0
+        route_name = route_names.get(row.route_id)
+        if route_name is not None:
+            count = int(row.count)
             items.append(TopRouteItem(
-                route_id=route.id,
-                route_name=route.name,
-                request_count=row.count,
-                avg_latency_ms=float(row.avg_latency or 0),
-                cache_hit_rate=hit_rate,
-                error_rate=error_rate,
+                route_id=row.route_id,
+                route_name=route_name,
+                request_count=count,
+                avg_latency_ms=float(row.latency_sum) / count if count > 0 else 0.0,
+                cache_hit_rate=int(row.cache_hits) / count if count > 0 else 0.0,
+                error_rate=int(row.errors) / count if count > 0 else 0.0,
             ))
 
-    total_result = await db.execute(
-        select(func.count(RequestLog.id)).where(RequestLog.timestamp >= since)
-    )
-
-    return TopRoutesResponse(
+    response = TopRoutesResponse(
         items=items,
         period_start=since,
-        period_end=datetime.now(timezone.utc),
-        total_requests=total_result.scalar() or 0,
+        period_end=now,
+        total_requests=total,
     )
+    await _analytics_cache_store(cache_key, response)
+    return response
 
 
 @router.get("/analytics/cache-hit-rate", response_model=CacheHitRateResponse, dependencies=[AdminDep])
 async def get_cache_hit_rate(
     db: AsyncSession = Depends(get_db),
     hours: int = Query(24, ge=1, le=168),
-) -> CacheHitRateResponse:
+) -> CacheHitRateResponse | Response:
     """Get cache hit rate analytics."""
-    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    cache_key, cached = await _analytics_cache_lookup("cache-hit-rate", hours)
+    if cached:
+        return cached
+
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(hours=hours)
 
+    # One scan for both the per-route breakdown and the overall totals:
+    # GROUPING SETS ((route_id, name), ()) emits a row per route plus a
+    # grand-total row flagged by grouping(route_id) = 1.
     result = await db.execute(
         select(
-            func.count().filter(RequestLog.cache_status == CacheStatus.HIT).label("hits"),
-            func.count().filter(RequestLog.cache_status == CacheStatus.MISS).label("misses"),
-            func.count().filter(RequestLog.cache_status == CacheStatus.STALE).label("stale"),
-        ).where(RequestLog.timestamp >= since)
+            func.grouping(RequestLogRollup.route_id).label("is_total"),
+            Route.name.label("route_name"),
+            func.sum(RequestLogRollup.hit_count).label("hits"),
+            func.sum(RequestLogRollup.miss_count).label("misses"),
+            func.sum(RequestLogRollup.stale_count).label("stale"),
+        )
+        .select_from(RequestLogRollup)
+        .outerjoin(Route, Route.id == RequestLogRollup.route_id)
+        .where(_rollup_window(since))
+        .group_by(func.grouping_sets(tuple_(RequestLogRollup.route_id, Route.name), tuple_()))
     )
-    stats = result.one()
 
-    hits = stats.hits or 0
-    misses = stats.misses or 0
-    stale = stats.stale or 0
-    total = hits + misses + stale
-    hit_rate = (hits + stale) / total if total > 0 else 0.0
-
-    return CacheHitRateResponse(
-        overall_hit_rate=hit_rate,
+    hits = misses = stale = 0
+    by_route: dict[str, float] = {}
+    for row in result:
+        counts = int(row.hits or 0), int(row.misses or 0), int(row.stale or 0)
+        if row.is_total:
+            hits, misses, stale = counts
+        elif row.route_name is not None:
+            by_route[row.route_name] = _hit_rate(*counts)
+
+    response = CacheHitRateResponse(
+        overall_hit_rate=_hit_rate(hits, misses, stale),
         hits=hits,
         misses=misses,
         stale_hits=stale,
+        by_route=by_route,
         period_start=since,
-        period_end=datetime.now(timezone.utc),
+        period_end=now,
     )
+    await _analytics_cache_store(cache_key, response)
+    return response
+
+
+def _encode_log_cursor(timestamp: datetime, log_id: str) -> str:
+    """Encode the sort key of the last row on a request log page."""
+    raw = f"{timestamp.isoformat()}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _decode_log_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a request log cursor into its (timestamp, id) sort key."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, log_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), str(UUID(log_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
 
 
 @router.get("/analytics/logs", response_model=RequestLogsResponse, dependencies=[AdminDep])
@@ -753,79 +830,122 @@ async def get_request_logs(
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: str | None = None,
     tenant_id: str | None = None,
     route_id: str | None = None,
     status_code: int | None = None,
     cache_status: str | None = None,
-) -> RequestLogsResponse:
-    """Get paginated request logs."""
-    query = select(RequestLog)
+) -> Response:
+    """
+    Get paginated request logs.
+
+    Pass the returned next_cursor to seek straight to the following page;
+    unlike page, its cost does not grow with depth, but total is not counted.
+    """
+    cache_key, cached = await _analytics_cache_lookup(
+        "logs", page, page_size, cursor, tenant_id, route_id, status_code, cache_status
+    )
+    if cached:
+        return cached
 
+    filters = []
     if tenant_id:
-        query = query.where(RequestLog.tenant_id == tenant_id)
+        filters.append(RequestLog.tenant_id == tenant_id)
     if route_id:
-        query = query.where(RequestLog.route_id == route_id)
+        filters.append(RequestLog.route_id == route_id)
     if status_code:
-        query = query.where(RequestLog.status_code == status_code)
+        filters.append(RequestLog.status_code == status_code)
     if cache_status:
-        query = query.where(RequestLog.cache_status == cache_status)
-
-    # Get total count
-    count_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = count_result.scalar() or 0
+        filters.append(RequestLog.cache_status == cache_status)
 
-    # Get paginated results
-    result = await db.execute(
-        query
-        .order_by(RequestLog.timestamp.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
+    query = (
+        select(
+            RequestLog.id,
+            RequestLog.request_id,
+            RequestLog.timestamp,
+            RequestLog.tenant_id,
+            Tenant.name.label("tenant_name"),
+            RequestLog.api_key_id,
+            ApiKey.name.label("api_key_name"),
+            RequestLog.route_id,
+            Route.name.label("route_name"),
+            RequestLog.method,
+            RequestLog.path,
+            RequestLog.status_code,
+            RequestLog.latency_ms,
+            RequestLog.cache_status,
+            RequestLog.error_type,
+            RequestLog.client_ip,
+        )
+        .outerjoin(Tenant, Tenant.id == RequestLog.tenant_id)
+        .outerjoin(ApiKey, ApiKey.id == RequestLog.api_key_id)
+        .outerjoin(Route, Route.id == RequestLog.route_id)
+        .where(*filters)
+        .order_by(RequestLog.timestamp.desc(), RequestLog.id.desc())
     )
-    logs = result.scalars().all()
 
+    total: int | None
+    if cursor:
+        # Seek past the previous page; one extra row tells whether more follow
+        cursor_key = _decode_log_cursor(cursor)
+        result = await db.execute(
+            query.where(tuple_(RequestLog.timestamp, RequestLog.id) < tuple_(*cursor_key))
+            .limit(page_size + 1)
+        )
+        rows = result.mappings().all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        total = None
+    else:
+        # Get the page with the total count riding along as a window aggregate
+        result = await db.execute(
+            query.add_columns(func.count().over().label("total"))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        rows = result.mappings().all()
+        if rows:
+            total = rows[0]["total"]
+        elif page > 1:
+            # Past the last page: the window count has no row to ride on
+            count_result = await db.execute(
+                select(func.count()).select_from(RequestLog).where(*filters)
+            )
+            total = count_result.scalar() or 0
+        else:
+            total = 0
+        has_more = (page * page_size) < total
+
+    # Rows are shaped like RequestLogItem and dumped with orjson directly;
+    # building and re-serializing a model per row dominates large pages.
     items = []
-    for log in logs:
-        # Get related names
-        tenant_name = None
-        api_key_name = None
-        route_name = None
-
-        if log.tenant_id:
-            t_result = await db.execute(select(Tenant.name).where(Tenant.id == log.tenant_id))
-            tenant_name = t_result.scalar()
-        if log.api_key_id:
-            k_result = await db.execute(select(ApiKey.name).where(ApiKey.id == log.api_key_id))
-            api_key_name = k_result.scalar()
-        if log.route_id:
-            r_result = await db.execute(select(Route.name).where(Route.id == log.route_id))
-            route_name = r_result.scalar()
-
-        items.append(RequestLogItem(
-            id=log.id,
-            request_id=log.request_id,
-            timestamp=log.timestamp,
-            tenant_id=log.tenant_id,
-            tenant_name=tenant_name,
-            api_key_id=log.api_key_id,
-            api_key_name=api_key_name,
-            route_id=log.route_id,
-            route_name=route_name,
-            method=log.method,
-            path=log.path,
-            status_code=log.status_code,
-            latency_ms=log.latency_ms,
-            cache_status=log.cache_status.value if log.cache_status else "unknown",
-            error_type=log.error_type.value if log.error_type and log.error_type.value != "none" else None,
-            client_ip=log.client_ip,
-        ))
-
-    return RequestLogsResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        has_more=(page * page_size) < total,
+    for row in rows:
+        item = dict(row)
+        item.pop("total", None)
+        item["cache_status"] = (
+            CacheStatus(row["cache_status"]).value if row["cache_status"] else "unknown"
+        )
+        error_type = ErrorType(row["error_type"]) if row["error_type"] else ErrorType.NONE
+        item["error_type"] = error_type.value if error_type != ErrorType.NONE else None
+        items.append(item)
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = _encode_log_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+
+    body = orjson.dumps(
+        {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+        },
+        option=orjson.OPT_UTC_Z,
     )
+    await _analytics_cache_store(cache_key, body.decode())
+    return Response(body, media_type="application/json")
 
 
 # =============================================================================
@@ -841,6 +961,7 @@ async def purge_cache(data: CachePurgeRequest) -> CachePurgeResponse:
     if data.all:
         # Note: Full purge would require SCAN in production
         purged = 0  # Placeholder
+        await redis_client.incr(ANALYTICS_GENERATION_KEY)
         message = "Full cache purge initiated"
     elif data.route_name:
         purged = await cache_service.purge_by_prefix(f"cache:route:{data.route_name}")
@@ -864,31 +985,18 @@ async def get_blocked_keys(
     db: AsyncSession = Depends(get_db),
 ) -> list[BlockRuleResponse]:
     """Get all currently blocked API keys."""
+    # Rules are not unblocked here, so only an expired blocked_until deactivates one
+    is_active = or_(
+        BlockRule.blocked_until.is_(None),
+        BlockRule.blocked_until >= datetime.now(timezone.utc),
+    )
     result = await db.execute(
-        select(BlockRule)
+        select(*_BLOCK_RULE_COLUMNS, is_active.label("is_active"))
         .where(BlockRule.unblocked_at.is_(None))
         .order_by(BlockRule.blocked_at.desc())
     )
-    blocks = result.scalars().all()
-
-    return [
-        BlockRuleResponse(
-            id=b.id,
-            api_key_id=b.api_key_id,
-            reason=b.reason.value if isinstance(b.reason, BlockReason) else b.reason,
-            reason_detail=b.reason_detail,
-            anomaly_score=b.anomaly_score,
-            rate_at_block=b.rate_at_block,
-            error_rate_at_block=b.error_rate_at_block,
-            blocked_at=b.blocked_at,
-            blocked_until=b.blocked_until,
-            unblocked_at=b.unblocked_at,
-            unblocked_by=b.unblocked_by,
-            unblock_reason=b.unblock_reason,
-            is_active=b.is_active,
-        )
-        for b in blocks
-    ]
+
+    return [BlockRuleResponse.model_construct(**row) for row in result.mappings()]
 
 
 @router.post("/abuse/unblock/{api_key_id}", dependencies=[AdminDep])
@@ -901,17 +1009,16 @@ async def unblock_api_key(
     # Unblock in Redis
     await abuse_detector.unblock(api_key_id)
 
-    # Update database block rules
+    # Close every active block rule in one statement
     result = await db.execute(
-        select(BlockRule)
+        update(BlockRule)
         .where(BlockRule.api_key_id == api_key_id)
         .where(BlockRule.unblocked_at.is_(None))
+        .values(
+            unblocked_at=datetime.now(timezone.utc),
+            unblock_reason=data.reason,
+            unblocked_by="admin",
+        )
     )
-    blocks = result.scalars().all()
-
-    for block in blocks:
-        block.unblocked_at = datetime.now(timezone.utc)
-        block.unblock_reason = data.reason
-        block.unblocked_by = "admin"
 
-    return {"unblocked": True, "blocks_cleared": len(blocks)}
+    return {"unblocked": True, "blocks_cleared": result.rowcount}
@@ -5,10 +5,14 @@ Provides endpoints to view algorithm stats, test algorithms,
 and manage algorithm instances.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import math
+from collections.abc import Awaitable, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 
 from src.api.admin import verify_admin_key
+from src.api.routing import FastSerializeRoute
 from src.services.algorithms import (
     AdaptiveRateLimiter,
     CircuitBreaker,
@@ -27,7 +31,7 @@ from src.services.algorithms import (
     get_adaptive_rate_limiter,
     get_leaky_bucket,
 )
-from src.services.abuse import abuse_detector, EWMACalculator, ZScoreDetector
+from src.services.abuse import abuse_detector, ZScoreDetector
 from src.services.bloom import bloom_filter, negative_cache
 from src.services.cache import cache_service, CacheKeyBuilder
 from src.services.rate_limiter import (
@@ -36,7 +40,7 @@ from src.services.rate_limiter import (
     token_bucket,
 )
 
-router = APIRouter(prefix="/algorithms", tags=["algorithms"])
+router = APIRouter(prefix="/algorithms", tags=["algorithms"], route_class=FastSerializeRoute)
 
 
 # =============================================================================
@@ -197,95 +201,100 @@ class AlgorithmSummary(BaseModel):
 # =============================================================================
 
 
+# The summary is static, so it is built and serialized once at import
+_ALGORITHM_SUMMARY = AlgorithmSummary(
+    rate_limiters=[
+        {
+            "name": "Token Bucket",
+            "description": "Allows bursts up to bucket capacity, refills at constant rate",
+            "use_cases": ["API rate limiting", "Bursty traffic"],
+            "endpoint": "/algorithms/rate-limit/test",
+        },
+        {
+            "name": "Sliding Window",
+            "description": "Precise rate limiting with request timestamps",
+            "use_cases": ["Strict rate enforcement", "No burst allowance"],
+            "endpoint": "/algorithms/rate-limit/test",
+        },
+        {
+            "name": "Leaky Bucket",
+            "description": "Enforces strict output rate by queuing requests",
+            "use_cases": ["Traffic shaping", "Smooth output"],
+            "endpoint": "/algorithms/rate-limit/test",
+        },
+        {
+            "name": "Adaptive Rate Limiter",
+            "description": "Dynamically adjusts limits based on system load",
+            "use_cases": ["Auto-scaling", "System protection"],
+            "endpoint": "/algorithms/adaptive/status",
+        },
+    ],
+    data_structures=[
+        {
+            "name": "Bloom Filter",
+            "description": "Probabilistic set membership test",
+            "use_cases": ["Negative caching", "404 detection"],
+            "endpoint": "/algorithms/bloom/test",
+        },
+        {
+            "name": "Count-Min Sketch",
+            "description": "Approximate frequency counting",
+            "use_cases": ["Heavy hitters", "Top-K detection"],
+            "endpoint": "/algorithms/cms/test",
+        },
+        {
+            "name": "HyperLogLog",
+            "description": "Cardinality estimation",
+            "use_cases": ["Unique visitors", "Distinct counts"],
+            "endpoint": "/algorithms/hll/test",
+        },
+        {
+            "name": "Consistent Hash",
+            "description": "Distributed key routing",
+            "use_cases": ["Cache sharding", "Load balancing"],
+            "endpoint": "/algorithms/consistent-hash/test",
+        },
+    ],
+    patterns=[
+        {
+            "name": "Circuit Breaker",
+            "description": "Prevents cascading failures",
+            "use_cases": ["Upstream protection", "Graceful degradation"],
+            "endpoint": "/algorithms/circuit-breaker/test",
+        },
+        {
+            "name": "EWMA",
+            "description": "Exponentially weighted moving average",
+            "use_cases": ["Trend detection", "Smoothing"],
+            "endpoint": "/algorithms/ewma/test",
+        },
+        {
+            "name": "Z-Score",
+            "description": "Anomaly detection via standard deviations",
+            "use_cases": ["Abuse detection", "Spike detection"],
+            "endpoint": "/algorithms/zscore/test",
+        },
+        {
+            "name": "Exponential Backoff",
+            "description": "Retry strategy with increasing delays",
+            "use_cases": ["Retry logic", "Failure recovery"],
+            "endpoint": "/algorithms/backoff/test",
+        },
+    ],
+)
+_ALGORITHM_SUMMARY_JSON = _ALGORITHM_SUMMARY.model_dump_json().encode()
+
+
 @router.get("/summary", response_model=AlgorithmSummary)
 async def get_algorithms_summary(
     _: str = Depends(verify_admin_key),
-) -> AlgorithmSummary:
+) -> Response:
     """
     Get a summary of all available algorithms.
     
     Returns descriptions and use cases for each algorithm.
     """
-    return AlgorithmSummary(
-        rate_limiters=[
-            {
-                "name": "Token Bucket",
-                "description": "Allows bursts up to bucket capacity, refills at constant rate",
-                "use_cases": ["API rate limiting", "Bursty traffic"],
-                "endpoint": "/algorithms/rate-limit/test",
-            },
-            {
-                "name": "Sliding Window",
-                "description": "Precise rate limiting with request timestamps",
-                "use_cases": ["Strict rate enforcement", "No burst allowance"],
-                "endpoint": "/algorithms/rate-limit/test",
-            },
-            {
-                "name": "Leaky Bucket",
-                "description": "Enforces strict output rate by queuing requests",
-                "use_cases": ["Traffic shaping", "Smooth output"],
-                "endpoint": "/algorithms/rate-limit/test",
-            },
-            {
-                "name": "Adaptive Rate Limiter",
-                "description": "Dynamically adjusts limits based on system load",
-                "use_cases": ["Auto-scaling", "System protection"],
-                "endpoint": "/algorithms/adaptive/status",
-            },
-        ],
-        data_structures=[
-            {
-                "name": "Bloom Filter",
-                "description": "Probabilistic set membership test",
-                "use_cases": ["Negative caching", "404 detection"],
-                "endpoint": "/algorithms/bloom/test",
-            },
-            {
-                "name": "Count-Min Sketch",
-                "description": "Approximate frequency counting",
-                "use_cases": ["Heavy hitters", "Top-K detection"],
-                "endpoint": "/algorithms/cms/test",
-            },
-            {
-                "name": "HyperLogLog",
-                "description": "Cardinality estimation",
-                "use_cases": ["Unique visitors", "Distinct counts"],
-                "endpoint": "/algorithms/hll/test",
-            },
-            {
-                "name": "Consistent Hash",
-                "description": "Distributed key routing",
-                "use_cases": ["Cache sharding", "Load balancing"],
-                "endpoint": "/algorithms/consistent-hash/test",
-            },
-        ],
-        patterns=[
-            {
-                "name": "Circuit Breaker",
-                "description": "Prevents cascading failures",
-                "use_cases": ["Upstream protection", "Graceful degradation"],
-                "endpoint": "/algorithms/circuit-breaker/test",
-            },
-            {
-                "name": "EWMA",
-                "description": "Exponentially weighted moving average",
-                "use_cases": ["Trend detection", "Smoothing"],
-                "endpoint": "/algorithms/ewma/test",
-            },
-            {
-                "name": "Z-Score",
-                "description": "Anomaly detection via standard deviations",
-                "use_cases": ["Abuse detection", "Spike detection"],
-                "endpoint": "/algorithms/zscore/test",
-            },
-            {
-                "name": "Exponential Backoff",
-                "description": "Retry strategy with increasing delays",
-                "use_cases": ["Retry logic", "Failure recovery"],
-                "endpoint": "/algorithms/backoff/test",
-            },
-        ],
-    )
+    return Response(_ALGORITHM_SUMMARY_JSON, media_type="application/json")
 
 
 # Rate Limiting
@@ -352,6 +361,34 @@ async def test_rate_limiter(
 
 
 # Circuit Breaker
+async def _cb_check(cb: CircuitBreaker) -> bool:
+    return await cb.can_execute()
+
+
+async def _cb_success(cb: CircuitBreaker) -> bool:
+    await cb.record_success()
+    return await cb.can_execute()
+
+
+async def _cb_failure(cb: CircuitBreaker) -> bool:
+    await cb.record_failure()
+    return await cb.can_execute()
+
+
+async def _cb_reset(cb: CircuitBreaker) -> bool:
+    await cb.reset()
+    return True
+
+
+# Action -> handler returning whether the breaker now allows execution
+_CIRCUIT_BREAKER_ACTIONS: dict[str, Callable[[CircuitBreaker], Awaitable[bool]]] = {
+    "check": _cb_check,
+    "success": _cb_success,
+    "failure": _cb_failure,
+    "reset": _cb_reset,
+}
+
+
 @router.post("/circuit-breaker/test", response_model=CircuitBreakerResponse)
 async def test_circuit_breaker(
     request: CircuitBreakerTestRequest,
@@ -364,22 +401,13 @@ async def test_circuit_breaker(
     """
     cb = circuit_breaker_manager.get(request.name)
 
-    if request.action == "check":
-        can_execute = await cb.can_execute()
-    elif request.action == "success":
-        await cb.record_success()
-        can_execute = await cb.can_execute()
-    elif request.action == "failure":
-        await cb.record_failure()
-        can_execute = await cb.can_execute()
-    elif request.action == "reset":
-        await cb.reset()
-        can_execute = True
-    else:
+    handler = _CIRCUIT_BREAKER_ACTIONS.get(request.action)
+    if handler is None:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown action: {request.action}",
         )
+    can_execute = await handler(cb)
 
     stats = await cb.get_stats()
     return CircuitBreakerResponse(
@@ -396,6 +424,14 @@ async def test_circuit_breaker(
 
 
 # Bloom Filter
+# Action -> filter operation on the item; "stats" only reports the filter state
+_BLOOM_ACTIONS: dict[str, Callable[[str], Awaitable[bool]] | None] = {
+    "add": bloom_filter.add,
+    "check": bloom_filter.contains,
+    "stats": None,
+}
+
+
 @router.post("/bloom/test", response_model=BloomFilterResponse)
 async def test_bloom_filter(
     request: BloomFilterTestRequest,
@@ -406,19 +442,13 @@ async def test_bloom_filter(
     
     Actions: add, check, stats
     """
-    result = None
-
-    if request.action == "add":
-        result = await bloom_filter.add(request.item)
-    elif request.action == "check":
-        result = await bloom_filter.contains(request.item)
-    elif request.action == "stats":
-        pass
-    else:
+    if request.action not in _BLOOM_ACTIONS:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown action: {request.action}",
         )
+    operation = _BLOOM_ACTIONS[request.action]
+    result = await operation(request.item) if operation else None
 
     return BloomFilterResponse(
         action=request.action,
@@ -429,6 +459,15 @@ async def test_bloom_filter(
 
 
 # Count-Min Sketch
+_count_min_sketch = CountMinSketch(name="cms:test")
+
+# Action -> sketch operation returning the item's (estimated) count
+_CMS_ACTIONS: dict[str, Callable[[CountMinSketch, CountMinSketchRequest], Awaitable[int]]] = {
+    "add": lambda cms, request: cms.add(request.item, request.count),
+    "query": lambda cms, request: cms.query(request.item),
+}
+
+
 @router.post("/cms/test", response_model=CountMinSketchResponse)
 async def test_count_min_sketch(
     request: CountMinSketchRequest,
@@ -439,17 +478,15 @@ async def test_count_min_sketch(
     
     Actions: add, query
     """
-    cms = CountMinSketch(name="cms:test")
+    cms = _count_min_sketch
 
-    if request.action == "add":
-        count = await cms.add(request.item, request.count)
-    elif request.action == "query":
-        count = await cms.query(request.item)
-    else:
+    operation = _CMS_ACTIONS.get(request.action)
+    if operation is None:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown action: {request.action}",
         )
+    count = await operation(cms, request)
 
     return CountMinSketchResponse(
         action=request.action,
@@ -460,7 +497,19 @@ async def test_count_min_sketch(
 
 
 # Consistent Hash
+# Treated as immutable once published: mutations copy the ring, change the
+# copy and rebind the name, so lookups never observe a half-updated ring.
 _consistent_hash = ConsistentHash(nodes=["node-1", "node-2", "node-3"])
+# Distribution of the published ring; reset whenever a new ring is swapped in.
+_cached_distribution: dict[str, int] | None = None
+
+
+def _ring_distribution() -> dict[str, int]:
+    """Return the published ring's distribution, computing it once per ring."""
+    global _cached_distribution
+    if _cached_distribution is None:
+        _cached_distribution = _consistent_hash.get_distribution()
+    return _cached_distribution
 
 
 @router.post("/consistent-hash/test", response_model=ConsistentHashResponse)
@@ -473,7 +522,7 @@ async def test_consistent_hash(
     
     Actions: lookup, add_node, remove_node
     """
-    global _consistent_hash
+    global _consistent_hash, _cached_distribution
 
     if request.action == "lookup":
         node = _consistent_hash.get_node(request.key)
@@ -481,29 +530,35 @@ async def test_consistent_hash(
             action="lookup",
             key=request.key,
             node=node,
-            distribution=_consistent_hash.get_distribution(),
+            distribution=_ring_distribution(),
         )
 
     elif request.action == "add_node":
         if not request.node:
             raise HTTPException(status_code=400, detail="Node name required")
-        _consistent_hash.add_node(request.node)
+        ring = _consistent_hash.copy()
+        ring.add_node(request.node)
+        _consistent_hash = ring
+        _cached_distribution = None
         return ConsistentHashResponse(
             action="add_node",
             key=None,
             node=request.node,
-            distribution=_consistent_hash.get_distribution(),
+            distribution=_ring_distribution(),
         )
 
     elif request.action == "remove_node":
         if not request.node:
             raise HTTPException(status_code=400, detail="Node name required")
-        _consistent_hash.remove_node(request.node)
+        ring = _consistent_hash.copy()
+        ring.remove_node(request.node)
+        _consistent_hash = ring
+        _cached_distribution = None
         return ConsistentHashResponse(
             action="remove_node",
             key=None,
             node=request.node,
-            distribution=_consistent_hash.get_distribution(),
+            distribution=_ring_distribution(),
         )
 
     else:
@@ -514,6 +569,9 @@ async def test_consistent_hash(
 
 
 # HyperLogLog
+_hyperloglog = HyperLogLog(name="hll:test")
+
+
 @router.post("/hll/test", response_model=HyperLogLogResponse)
 async def test_hyperloglog(
     request: HyperLogLogRequest,
@@ -524,7 +582,7 @@ async def test_hyperloglog(
     
     Actions: add, count, clear
     """
-    hll = HyperLogLog(name="hll:test")
+    hll = _hyperloglog
 
     if request.action == "add":
         if request.items:
@@ -570,17 +628,23 @@ async def test_ewma(
     
     Shows how EWMA smooths values over time.
     """
+    # Same recurrence as EWMACalculator.update / update_variance, inlined
+    # with hoisted locals so long series avoid two method calls per value.
+    alpha = request.alpha
+    decay = 1 - alpha
     ewma = 0.0
     variance = 0.0
     ewma_values = []
+    append = ewma_values.append
+    floor = math.floor
 
     for value in request.values:
-        old_ewma = ewma
-        ewma = EWMACalculator.update(ewma, value, request.alpha)
-        variance = EWMACalculator.update_variance(variance, old_ewma, value, request.alpha)
-        ewma_values.append(round(ewma, 4))
+        diff = value - ewma
+        variance = decay * (variance + alpha * diff * diff)
+        ewma = value if ewma == 0 else alpha * value + decay * ewma
+        # Scaled floor rounds to 4 places (half up) at a third of round()'s cost
+        append(floor(ewma * 10000 + 0.5) / 10000)
 
-    import math
     std_dev = math.sqrt(variance)
 
     return EWMATestResponse(
@@ -637,11 +701,17 @@ async def test_backoff(
 
     result = backoff.get_delay(request.attempt)
 
-    # Calculate progression
+    # Calculate progression: delays double until they hit max_delay, then
+    # stay capped; the final attempt never retries.
+    retries = max(request.max_attempts - 1, 0)
     progression = []
-    for i in range(1, request.max_attempts + 1):
-        r = backoff.get_delay(i)
-        progression.append(round(r.delay_seconds, 2))
+    delay = request.base_delay
+    while len(progression) < retries and delay < request.max_delay:
+        progression.append(round(delay, 2))
+        delay *= 2
+    progression.extend([round(request.max_delay, 2)] * (retries - len(progression)))
+    if request.max_attempts > 0:
+        progression.append(0.0)
 
     return BackoffTestResponse(
         attempt=request.attempt,
@@ -4,69 +4,31 @@ import time
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.background import BackgroundTask
 
+from src.config import get_settings
 from src.database import get_db
 from src.gateway.proxy import GatewayProxy, gateway_proxy
-from src.gateway.router import GatewayRouter
-from src.models import RequestLog
+from src.gateway.router import gateway_router
+from src.middleware.logging import get_client_ip
 from src.models.request_log import CacheStatus, ErrorType
 from src.services.abuse import abuse_detector
+from src.services.request_log_writer import request_log_writer
 
 router = APIRouter(tags=["Gateway"])
 
+# Feature switches are fixed for the process lifetime, so read them once
+_settings = get_settings()
+_ABUSE_DETECTION_ENABLED = _settings.abuse_detection_enabled
+_REQUEST_LOGGING_ENABLED = _settings.request_logging_enabled
 
-async def log_request(
-    db_factory,
-    request_id: str,
-    tenant_id: str | None,
-    api_key_id: str | None,
-    route_id: str | None,
-    method: str,
-    path: str,
-    query_string: str | None,
-    client_ip: str | None,
-    user_agent: str | None,
-    status_code: int,
-    latency_ms: int,
-    cache_status: CacheStatus,
-    error_type: ErrorType,
-    upstream_latency_ms: int | None,
-    upstream_status: int | None,
-    response_size: int | None,
-) -> None:
-    """Background task to log request metrics."""
-    from src.database import get_db_context
+_GATEWAY_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"]
+_ALLOW_HEADER = ", ".join(_GATEWAY_METHODS)
 
-    async with get_db_context() as db:
-        log_entry = RequestLog(
-            request_id=request_id,
-            timestamp=datetime.now(timezone.utc),
-            tenant_id=tenant_id,
-            api_key_id=api_key_id,
-            route_id=route_id,
-            method=method,
-            path=path,
-            query_string=query_string,
-            client_ip=client_ip,
-            user_agent=user_agent,
-            status_code=status_code,
-            latency_ms=latency_ms,
-            cache_status=cache_status,
-            error_type=error_type,
-            upstream_latency_ms=upstream_latency_ms,
-            upstream_status_code=upstream_status,
-            response_size_bytes=response_size,
-        )
-        db.add(log_entry)
 
-
-@router.api_route(
-    "/g/{route_name}/{path:path}",
-    methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
-)
+@router.api_route("/g/{route_name}/{path:path}", methods=_GATEWAY_METHODS)
 async def gateway_proxy_handler(
     request: Request,
     route_name: str,
@@ -92,207 +54,151 @@ async def gateway_proxy_handler(
     - Quota enforcement
     - Abuse detection
     """
+    # CORSMiddleware answers preflights; any other OPTIONS gets a fixed
+    # answer without touching the database or the upstream
+    if request.method == "OPTIONS":
+        return Response(status_code=204, headers={"Allow": _ALLOW_HEADER})
+
     start_time = time.perf_counter()
+    received_at = datetime.now(timezone.utc)
     request_id = getattr(request.state, "request_id", "unknown")
 
     # Get client info
-    client_ip = _get_client_ip(request)
+    client_ip = get_client_ip(request)
     user_agent = request.headers.get("User-Agent")
     query_string = str(request.query_params) if request.query_params else None
-
-    # Create router and process request
-    router_instance = GatewayRouter(db)
+    forward_path = f"/{path}" if path else "/"
+
+    # RequestLog columns known up front; each outcome adds the rest
+    log_fields = {
+        "request_id": request_id,
+        "timestamp": received_at,
+        "method": request.method,
+        "path": f"/g/{route_name}/{path}",
+        "query_string": query_string,
+        "client_ip": client_ip,
+        "user_agent": user_agent,
+    }
+
+    # Process request
     api_key_header = request.headers.get("X-API-Key")
 
-    context = await router_instance.process_request(
+    context = await gateway_router.process_request(
+        db,
         route_name=route_name,
-        path=f"/{path}" if path else "/",
+        path=forward_path,
         method=request.method,
         api_key_header=api_key_header,
+        now=received_at,
     )
 
+    tenant_id = api_key_id = route_id = None
+
+    def error_response(
+        status_code: int,
+        error: str,
+        message: str | None,
+        error_type: ErrorType,
+        headers: dict[str, str] | None = None,
+        **extra,
+    ) -> ORJSONResponse:
+        """Build a gateway error response, logging the request in background if enabled."""
+        response = ORJSONResponse(
+            status_code=status_code,
+            content={"error": error, "message": message, **extra, "request_id": request_id},
+            headers=headers,
+        )
+        if _REQUEST_LOGGING_ENABLED:
+            response.background = BackgroundTask(
+                request_log_writer.enqueue,
+                {
+                    **log_fields,
+                    "tenant_id": tenant_id,
+                    "api_key_id": api_key_id,
+                    "route_id": route_id,
+                    "status_code": status_code,
+                    "latency_ms": int((time.perf_counter() - start_time) * 1000),
+                    "cache_status": CacheStatus.BYPASS,
+                    "error_type": error_type,
+                    "upstream_latency_ms": None,
+                    "upstream_status_code": None,
+                    "response_size_bytes": None,
+                },
+            )
+        return response
+
     # Handle authentication errors
     if not context.auth.authenticated:
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        error_response = JSONResponse(
-            status_code=401 if context.auth.error_code in ("missing_api_key", "invalid_api_key") else 403,
-            content={
-                "error": context.auth.error_code,
-                "message": context.auth.error,
-                "request_id": request_id,
-            },
+        return error_response(
+            401 if context.auth.error_code in ("missing_api_key", "invalid_api_key") else 403,
+            context.auth.error_code,
+            context.auth.error,
+            ErrorType.AUTH_FAILED,
         )
-        error_response.background = BackgroundTask(
-            log_request,
-            db_factory=None,
-            request_id=request_id,
-            tenant_id=None,
-            api_key_id=None,
-            route_id=None,
-            method=request.method,
-            path=f"/g/{route_name}/{path}",
-            query_string=query_string,
-            client_ip=client_ip,
-            user_agent=user_agent,
-            status_code=error_response.status_code,
-            latency_ms=latency_ms,
-            cache_status=CacheStatus.BYPASS,
-            error_type=ErrorType.AUTH_FAILED,
-            upstream_latency_ms=None,
-            upstream_status=None,
-            response_size=None,
-        )
-        return error_response
 
-    tenant_id = context.auth.tenant.id if context.auth.tenant else None
+    tenant_id = context.auth.tenant_id
     api_key_id = context.auth.api_key.id if context.auth.api_key else None
 
     # Handle route not found
     if not context.route_match.matched:
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        return JSONResponse(
-            status_code=404,
-            content={
-                "error": "route_not_found",
-                "message": context.route_match.error,
-                "request_id": request_id,
-            },
-            background=BackgroundTask(
-                log_request,
-                db_factory=None,
-                request_id=request_id,
-                tenant_id=tenant_id,
-                api_key_id=api_key_id,
-                route_id=None,
-                method=request.method,
-                path=f"/g/{route_name}/{path}",
-                query_string=query_string,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                status_code=404,
-                latency_ms=latency_ms,
-                cache_status=CacheStatus.BYPASS,
-                error_type=ErrorType.VALIDATION_ERROR,
-                upstream_latency_ms=None,
-                upstream_status=None,
-                response_size=None,
-            ),
+        return error_response(
+            404,
+            "route_not_found",
+            context.route_match.error,
+            ErrorType.VALIDATION_ERROR,
         )
 
     route_id = context.route_match.route.id
 
     # Handle abuse block
     if context.abuse_check and context.abuse_check.is_blocked:
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        return JSONResponse(
-            status_code=429,
-            content={
-                "error": "blocked",
-                "message": f"Temporarily blocked: {context.abuse_check.reason}",
-                "retry_after": int(context.abuse_check.block_until - time.time()) if context.abuse_check.block_until else 300,
-                "request_id": request_id,
-            },
-            headers={"Retry-After": str(int(context.abuse_check.block_until - time.time()) if context.abuse_check.block_until else 300)},
-            background=BackgroundTask(
-                log_request,
-                db_factory=None,
-                request_id=request_id,
-                tenant_id=tenant_id,
-                api_key_id=api_key_id,
-                route_id=route_id,
-                method=request.method,
-                path=f"/g/{route_name}/{path}",
-                query_string=query_string,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                status_code=429,
-                latency_ms=latency_ms,
-                cache_status=CacheStatus.BYPASS,
-                error_type=ErrorType.BLOCKED,
-                upstream_latency_ms=None,
-                upstream_status=None,
-                response_size=None,
-            ),
+        block_until = context.abuse_check.block_until
+        retry_after = int(block_until - time.time()) if block_until else 300
+        return error_response(
+            429,
+            "blocked",
+            f"Temporarily blocked: {context.abuse_check.reason}",
+            ErrorType.BLOCKED,
+            headers={"Retry-After": str(retry_after)},
+            retry_after=retry_after,
         )
 
+    # Rate limit headers go on both the 429 and the proxied response
+    rate_limit = context.rate_limit
+    if rate_limit:
+        rate_limit_headers = {
+            "X-RateLimit-Limit": str(rate_limit.limit),
+            "X-RateLimit-Remaining": str(rate_limit.remaining),
+            "X-RateLimit-Reset": str(int(rate_limit.reset_after_seconds)),
+        }
+
     # Handle rate limiting
-    if context.rate_limit and not context.rate_limit.allowed:
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        return JSONResponse(
-            status_code=429,
-            content={
-                "error": "rate_limited",
-                "message": "Rate limit exceeded",
-                "retry_after": context.rate_limit.retry_after,
-                "limit": context.rate_limit.limit,
-                "remaining": context.rate_limit.remaining,
-                "request_id": request_id,
-            },
-            headers={
-                "Retry-After": str(int(context.rate_limit.retry_after or 1)),
-                "X-RateLimit-Limit": str(context.rate_limit.limit),
-                "X-RateLimit-Remaining": str(context.rate_limit.remaining),
-                "X-RateLimit-Reset": str(int(context.rate_limit.reset_after_seconds)),
-            },
-            background=BackgroundTask(
-                log_request,
-                db_factory=None,
-                request_id=request_id,
-                tenant_id=tenant_id,
-                api_key_id=api_key_id,
-                route_id=route_id,
-                method=request.method,
-                path=f"/g/{route_name}/{path}",
-                query_string=query_string,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                status_code=429,
-                latency_ms=latency_ms,
-                cache_status=CacheStatus.BYPASS,
-                error_type=ErrorType.RATE_LIMITED,
-                upstream_latency_ms=None,
-                upstream_status=None,
-                response_size=None,
-            ),
+    if rate_limit and not rate_limit.allowed:
+        return error_response(
+            429,
+            "rate_limited",
+            "Rate limit exceeded",
+            ErrorType.RATE_LIMITED,
+            headers={"Retry-After": str(int(rate_limit.retry_after or 1)), **rate_limit_headers},
+            retry_after=rate_limit.retry_after,
+            limit=rate_limit.limit,
+            remaining=rate_limit.remaining,
         )
 
     # Handle quota exceeded
     if not context.quota_allowed:
-        latency_ms = int((time.perf_counter() - start_time) * 1000)
-        return JSONResponse(
-            status_code=429,
-            content={
-                "error": "quota_exceeded",
-                "message": f"Quota exceeded: {context.quota_error}",
-                "request_id": request_id,
-            },
-            background=BackgroundTask(
-                log_request,
-                db_factory=None,
-                request_id=request_id,
-                tenant_id=tenant_id,
-                api_key_id=api_key_id,
-                route_id=route_id,
-                method=request.method,
-                path=f"/g/{route_name}/{path}",
-                query_string=query_string,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                status_code=429,
-                latency_ms=latency_ms,
-                cache_status=CacheStatus.BYPASS,
-                error_type=ErrorType.QUOTA_EXCEEDED,
-                upstream_latency_ms=None,
-                upstream_status=None,
-                response_size=None,
-            ),
+        return error_response(
+            429,
+            "quota_exceeded",
+            f"Quota exceeded: {context.quota_error}",
+            ErrorType.QUOTA_EXCEEDED,
         )
 
     # Proxy the request
     proxy_result = await gateway_proxy.proxy_request(
         request=request,
         context=context,
-        path=f"/{path}" if path else "/",
+        path=forward_path,
     )
 
     latency_ms = int((time.perf_counter() - start_time) * 1000)
@@ -301,58 +207,36 @@ async def gateway_proxy_handler(
     request.state.cache_status = proxy_result.cache_status.value
 
     # Add rate limit headers to response
-    if context.rate_limit:
-        proxy_result.response.headers["X-RateLimit-Limit"] = str(context.rate_limit.limit)
-        proxy_result.response.headers["X-RateLimit-Remaining"] = str(context.rate_limit.remaining)
-        proxy_result.response.headers["X-RateLimit-Reset"] = str(int(context.rate_limit.reset_after_seconds))
+    if rate_limit:
+        proxy_result.response.headers.update(rate_limit_headers)
 
     # Add request ID
     proxy_result.response.headers["X-Request-Id"] = request_id
 
     # Record abuse metrics
-    is_error = proxy_result.error_type != ErrorType.NONE or proxy_result.response.status_code >= 400
-    await abuse_detector.record_request(
-        api_key_id=api_key_id,
-        is_error=is_error,
-        error_type=proxy_result.error_type.value if is_error else None,
-    )
+    if _ABUSE_DETECTION_ENABLED:
+        is_error = (
+            proxy_result.error_type != ErrorType.NONE or proxy_result.response.status_code >= 400
+        )
+        await abuse_detector.track_request(api_key_id, is_error=is_error)
 
     # Log request in background
-    proxy_result.response.background = BackgroundTask(
-        log_request,
-        db_factory=None,
-        request_id=request_id,
-        tenant_id=tenant_id,
-        api_key_id=api_key_id,
-        route_id=route_id,
-        method=request.method,
-        path=f"/g/{route_name}/{path}",
-        query_string=query_string,
-        client_ip=client_ip,
-        user_agent=user_agent,
-        status_code=proxy_result.response.status_code,
-        latency_ms=latency_ms,
-        cache_status=proxy_result.cache_status,
-        error_type=proxy_result.error_type,
-        upstream_latency_ms=proxy_result.upstream_latency_ms,
-        upstream_status=proxy_result.upstream_status,
-        response_size=len(proxy_result.response.body) if hasattr(proxy_result.response, "body") else None,
-    )
+    if _REQUEST_LOGGING_ENABLED:
+        proxy_result.response.background = BackgroundTask(
+            request_log_writer.enqueue,
+            {
+                **log_fields,
+                "tenant_id": tenant_id,
+                "api_key_id": api_key_id,
+                "route_id": route_id,
+                "status_code": proxy_result.response.status_code,
+                "latency_ms": latency_ms,
+                "cache_status": proxy_result.cache_status,
+                "error_type": proxy_result.error_type,
+                "upstream_latency_ms": proxy_result.upstream_latency_ms,
+                "upstream_status_code": proxy_result.upstream_status,
+                "response_size_bytes": proxy_result.response_size_bytes,
+            },
+        )
 
     return proxy_result.response
-
-
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded_for = request.headers.get("X-Forwarded-For")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
-
-    if request.client:
-        return request.client.host
-
-    return "unknown"
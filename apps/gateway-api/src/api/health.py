@@ -1,13 +1,20 @@
 """Health check and metrics endpoints."""
 
+import asyncio
+import time
+from collections.abc import Iterator
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src import __version__
-from src.database import get_db
+from src.database import get_db, get_pool_status
 from src.schemas.common import HealthResponse, MetricsResponse
 from src.services.cache import cache_metrics
 from src.services.rate_limiter import rate_limit_metrics
@@ -15,6 +22,84 @@ from src.services.redis_client import redis_client
 
 router = APIRouter(tags=["Health"])
 
+# Load balancer probes arrive in bursts; one round of checks answers them all
+HEALTH_CACHE_SECONDS = 1.0
+# A stuck backend is reported unhealthy instead of hanging the probe
+HEALTH_PROBE_TIMEOUT_SECONDS = 2.0
+
+_last_health: tuple[float, HealthResponse] | None = None
+
+
+class GatewayMetricsCollector(Collector):
+    """
+    Exports the gateway's in-process counters to prometheus_client.
+
+    The counters stay plain integers bumped on the event loop; they are
+    only read, as one snapshot, when Prometheus scrapes.
+    """
+
+    def collect(self) -> Iterator[Metric]:
+        hits, misses, stale_hits, _, hit_rate = cache_metrics.snapshot()
+        _, denied, quota_exceeded = rate_limit_metrics.snapshot()
+
+        yield CounterMetricFamily("heliox_cache_hits", "Total cache hits", value=hits)
+        yield CounterMetricFamily("heliox_cache_misses", "Total cache misses", value=misses)
+        yield CounterMetricFamily(
+            "heliox_cache_stale", "Total stale cache hits (SWR)", value=stale_hits
+        )
+        yield GaugeMetricFamily("heliox_cache_hit_rate", "Cache hit rate", value=hit_rate)
+        yield CounterMetricFamily(
+            "heliox_rate_limited", "Total rate limited requests", value=denied
+        )
+        yield CounterMetricFamily(
+            "heliox_quota_exceeded", "Total quota exceeded requests", value=quota_exceeded
+        )
+
+        pool = get_pool_status()
+        if pool:
+            yield GaugeMetricFamily(
+                "heliox_db_pool_size",
+                "Persistent database connections in the pool",
+                value=pool["size"],
+            )
+            yield GaugeMetricFamily(
+                "heliox_db_pool_checked_out",
+                "Database connections currently in use",
+                value=pool["checked_out"],
+            )
+            yield GaugeMetricFamily(
+                "heliox_db_pool_overflow",
+                "Connections open beyond the pool size",
+                value=pool["overflow"],
+            )
+
+
+REGISTRY.register(GatewayMetricsCollector())
+
+
+async def _check_database(db: AsyncSession) -> dict:
+    """Probe the database connection."""
+    try:
+        await asyncio.wait_for(db.execute(text("SELECT 1")), HEALTH_PROBE_TIMEOUT_SECONDS)
+        return {"status": "healthy"}
+    except TimeoutError:
+        return {"status": "unhealthy", "error": "Timed out"}
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
+
+async def _check_redis() -> dict:
+    """Probe the Redis connection."""
+    try:
+        if redis_client.is_demo_mode:
+            return {"status": "demo_mode", "message": "Using in-memory cache"}
+        await asyncio.wait_for(redis_client.get("health_check"), HEALTH_PROBE_TIMEOUT_SECONDS)
+        return {"status": "healthy"}
+    except TimeoutError:
+        return {"status": "unhealthy", "error": "Timed out"}
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e)}
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
@@ -26,24 +111,14 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
     - Redis connection
     - Overall service status
     """
-    components: dict = {}
-
-    # Check database
-    try:
-        await db.execute(text("SELECT 1"))
-        components["database"] = {"status": "healthy"}
-    except Exception as e:
-        components["database"] = {"status": "unhealthy", "error": str(e)}
+    global _last_health
+    now = time.monotonic()
+    if _last_health is not None and now - _last_health[0] < HEALTH_CACHE_SECONDS:
+        return _last_health[1]
 
-    # Check Redis
-    try:
-        if redis_client.is_demo_mode:
-            components["redis"] = {"status": "demo_mode", "message": "Using in-memory cache"}
-        else:
-            await redis_client.get("health_check")
-            components["redis"] = {"status": "healthy"}
-    except Exception as e:
-        components["redis"] = {"status": "unhealthy", "error": str(e)}
+    # The probes hit independent backends, so run them concurrently
+    database, redis = await asyncio.gather(_check_database(db), _check_redis())
+    components = {"database": database, "redis": redis}
 
     # Determine overall status
     all_healthy = all(
@@ -51,12 +126,14 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
         for c in components.values()
     )
 
-    return HealthResponse(
+    health = HealthResponse(
         status="healthy" if all_healthy else "degraded",
         version=__version__,
         timestamp=datetime.utcnow(),
         components=components,
     )
+    _last_health = (now, health)
+    return health
 
 
 @router.get("/metrics", response_model=MetricsResponse)
@@ -69,52 +146,27 @@ async def get_metrics() -> MetricsResponse:
     - Rate limiting
     - Errors and blocks
     """
-    cache = cache_metrics.to_dict()
-    rate = rate_limit_metrics.to_dict()
+    hits, misses, stale_hits, _, _ = cache_metrics.snapshot()
+    _, denied, _ = rate_limit_metrics.snapshot()
+    pool = get_pool_status()
 
     return MetricsResponse(
-        cache_hit_total=cache["hits"],
-        cache_miss_total=cache["misses"],
-        cache_stale_total=cache["stale_hits"],
-        rate_limited_total=rate["denied"],
-        requests_total=cache["hits"] + cache["misses"] + cache["stale_hits"],
+        cache_hit_total=hits,
+        cache_miss_total=misses,
+        cache_stale_total=stale_hits,
+        rate_limited_total=denied,
+        requests_total=hits + misses + stale_hits,
+        db_pool_size=pool.get("size", 0),
+        db_pool_checked_out=pool.get("checked_out", 0),
+        db_pool_overflow=pool.get("overflow", 0),
     )
 
 
-@router.get("/metrics/prometheus")
-async def prometheus_metrics() -> str:
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
     """
     Get metrics in Prometheus text format.
     
     Suitable for scraping by Prometheus server.
     """
-    cache = cache_metrics.to_dict()
-    rate = rate_limit_metrics.to_dict()
-
-    lines = [
-        "# HELP heliox_cache_hits_total Total cache hits",
-        "# TYPE heliox_cache_hits_total counter",
-        f"heliox_cache_hits_total {cache['hits']}",
-        "",
-        "# HELP heliox_cache_misses_total Total cache misses",
-        "# TYPE heliox_cache_misses_total counter",
-        f"heliox_cache_misses_total {cache['misses']}",
-        "",
-        "# HELP heliox_cache_stale_total Total stale cache hits (SWR)",
-        "# TYPE heliox_cache_stale_total counter",
-        f"heliox_cache_stale_total {cache['stale_hits']}",
-        "",
-        "# HELP heliox_cache_hit_rate Cache hit rate",
-        "# TYPE heliox_cache_hit_rate gauge",
-        f"heliox_cache_hit_rate {cache['hit_rate']:.4f}",
-        "",
-        "# HELP heliox_rate_limited_total Total rate limited requests",
-        "# TYPE heliox_rate_limited_total counter",
-        f"heliox_rate_limited_total {rate['denied']}",
-        "",
-        "# HELP heliox_quota_exceeded_total Total quota exceeded requests",
-        "# TYPE heliox_quota_exceeded_total counter",
-        f"heliox_quota_exceeded_total {rate['quota_exceeded']}",
-    ]
-
-    return "\n".join(lines)
+    return PlainTextResponse(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
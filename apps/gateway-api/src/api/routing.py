@@ -0,0 +1,55 @@
+"""Custom route classes shared by API routers."""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+
+class FastSerializeRoute(APIRoute):
+    """
+    APIRoute that dumps response models straight to JSON bytes.
+
+    A TypeAdapter for the declared response_model is built once when the
+    route is registered, and the endpoint's return value is serialized with
+    it directly, skipping FastAPI's per-request validate + jsonable_encoder
+    pass. Endpoints must return instances of their response_model; sync
+    endpoints, routes without one, or endpoints returning a Response behave
+    as usual.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        response_model = kwargs.get("response_model")
+        if isinstance(response_model, DefaultPlaceholder):
+            response_model = None
+        if response_model is not None and inspect.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(
+                endpoint,
+                TypeAdapter(response_model),
+                kwargs.get("status_code") or 200,
+            )
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _wrap_endpoint(
+        endpoint: Callable[..., Any],
+        adapter: TypeAdapter,
+        status_code: int,
+    ) -> Callable[..., Any]:
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return Response(
+                content=adapter.dump_json(result, by_alias=True),
+                status_code=status_code,
+                media_type="application/json",
+            )
+
+        return wrapper
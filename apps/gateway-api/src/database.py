@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import QueuePool
 
 from src.config import get_settings
 
@@ -34,12 +35,26 @@ def get_engine() -> AsyncEngine:
             settings.database_url,
             echo=settings.debug,
             pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
         )
     return _engine
 
 
+def get_pool_status() -> dict[str, int]:
+    """Connection pool usage, or an empty dict if no pooled engine exists yet."""
+    if _engine is None or not isinstance(_engine.pool, QueuePool):
+        return {}
+    pool = _engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """Get or create the session factory."""
     global _session_factory
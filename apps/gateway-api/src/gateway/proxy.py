@@ -1,17 +1,17 @@
 """Gateway proxy - handles upstream requests with caching and coalescing."""
 
 import time
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
-from urllib.parse import parse_qs, urlencode
 
 import httpx
 import structlog
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
-from src.gateway.router import GatewayContext
-from src.models import CachePolicy, Route
+from src.config import get_settings
+from src.gateway.router import GatewayContext, PolicySnapshot, RouteSnapshot
 from src.models.request_log import CacheStatus, ErrorType
 from src.services.bloom import negative_cache
 from src.services.cache import (
@@ -24,8 +24,83 @@ from src.services.cache import (
 
 logger = structlog.get_logger(__name__)
 
+# Connection-level request headers that must not be forwarded upstream, as
+# the lowercase raw names ASGI servers deliver
+_HOP_BY_HOP_REQUEST_HEADERS = frozenset({
+    b"connection", b"keep-alive", b"proxy-authenticate",
+    b"proxy-authorization", b"te", b"trailers", b"transfer-encoding",
+    b"upgrade", b"host",
+})
+
+# Upstream framing headers; httpx has already decoded the body, so they are
+# recomputed for the body the gateway actually sends
+_UPSTREAM_FRAMING_HEADERS = frozenset({
+    "connection", "keep-alive", "transfer-encoding",
+    "content-encoding", "content-length",
+})
+
+# Methods whose requests carry no body worth forwarding
+_BODYLESS_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _response_headers(headers: httpx.Headers) -> dict[str, str]:
+    """Upstream response headers safe to send with the decoded body."""
+    return {k: v for k, v in headers.items() if k not in _UPSTREAM_FRAMING_HEADERS}
+
+
+async def _stream_body(
+    response: httpx.Response,
+    prefix: bytes = b"",
+    chunks: AsyncIterator[bytes] | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield an upstream body after the part already read, closing it when done."""
+    try:
+        if prefix:
+            yield prefix
+        async for chunk in chunks or response.aiter_bytes():
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+def _streaming_response(
+    response: httpx.Response,
+    prefix: bytes = b"",
+    chunks: AsyncIterator[bytes] | None = None,
+) -> StreamingResponse:
+    """Relay an open upstream response to the client without buffering it."""
+    return StreamingResponse(
+        _stream_body(response, prefix, chunks),
+        status_code=response.status_code,
+        headers=_response_headers(response.headers),
+    )
+
+
+async def _read_limited(
+    response: httpx.Response,
+    limit: int | None,
+) -> tuple[bytes, AsyncIterator[bytes] | None]:
+    """
+    Read an upstream body, stopping once it grows past limit bytes.
 
-@dataclass
+    Returns the bytes read and, for a body cut short, the iterator over the
+    rest; that response stays open for the caller to stream or close. Any
+    other outcome closes the response.
+    """
+    body = bytearray()
+    chunks = response.aiter_bytes()
+    try:
+        async for chunk in chunks:
+            body += chunk
+            if limit is not None and len(body) > limit:
+                return bytes(body), chunks
+    except BaseException:
+        await response.aclose()
+        raise
+    return bytes(body), None
+
+
+@dataclass(slots=True)
 class ProxyResult:
     """Result of proxying a request."""
 
@@ -34,16 +109,54 @@ class ProxyResult:
     error_type: ErrorType
     upstream_latency_ms: int | None = None
     upstream_status: int | None = None
+    response_size_bytes: int | None = None
+    # Open upstream response behind a streamed body, for closing it unread
+    upstream: httpx.Response | None = None
+
+    def __post_init__(self) -> None:
+        # Buffered responses are sized once up front; streamed ones are not
+        # known until sent and stay unsized
+        if self.response_size_bytes is None and not isinstance(self.response, StreamingResponse):
+            self.response_size_bytes = len(self.response.body)
 
 
 class NonCacheableUpstreamResponse(Exception):
-    """Raised when an upstream response should bypass caching."""
+    """
+    Raised when an upstream response should bypass caching.
 
-    def __init__(self, response: httpx.Response, reason: str, latency_ms: int) -> None:
+    body_prefix holds the body as read. A response over the policy's size
+    limit may still be open, with body_rest iterating the rest.
+    Coalesced requests share the exception, so exactly one of them may
+    claim() the open body.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        reason: str,
+        latency_ms: int,
+        body_prefix: bytes = b"",
+        body_rest: AsyncIterator[bytes] | None = None,
+    ) -> None:
         super().__init__(reason)
         self.response = response
         self.reason = reason
         self.upstream_latency_ms = latency_ms
+        self.body_prefix = body_prefix
+        self.body_rest = body_rest
+        self._claimed = False
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the body was cut short and is still open upstream."""
+        return self.body_rest is not None
+
+    def claim(self) -> bool:
+        """Take ownership of an open body; True for the first caller only."""
+        if not self.is_streaming or self._claimed:
+            return False
+        self._claimed = True
+        return True
 
 
 class GatewayProxy:
@@ -60,15 +173,26 @@ class GatewayProxy:
 
     def __init__(self, timeout_ms: int = 30000) -> None:
         self._default_timeout = timeout_ms / 1000  # Convert to seconds
-        self._client: httpx.AsyncClient | None = None
+        self._client: httpx.AsyncClient | None = self._create_client()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create the shared upstream client with the configured pool."""
+        settings = get_settings()
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            http2=settings.upstream_http2,
+            limits=httpx.Limits(
+                max_connections=settings.upstream_max_connections,
+                max_keepalive_connections=settings.upstream_max_keepalive_connections,
+                keepalive_expiry=settings.upstream_keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(self._default_timeout),
+        )
 
     async def get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
+        """Get the HTTP client, recreating it if it was closed."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=httpx.Timeout(self._default_timeout),
-            )
+            self._client = self._create_client()
         return self._client
 
     async def close(self) -> None:
@@ -94,11 +218,14 @@ class GatewayProxy:
         Returns:
             ProxyResult with response and metadata
         """
+        if request.method == "HEAD":
+            return await self._proxy_head(request, context, path)
+
         route = context.route_match.route
         policy = context.route_match.policy
 
         # Build cache key
-        cache_key = await self._build_cache_key(request, context, path)
+        cache_key, vary_key = await self._build_cache_key(request, context, path)
 
         # Check bloom filter for likely 404s
         if await self._check_bloom_filter(route.name, path):
@@ -121,7 +248,12 @@ class GatewayProxy:
         try:
             entry, status = await cache_service.get_or_fetch(
                 cache_key=cache_key,
-                fetch_fn=lambda: self._fetch_and_build_entry(request, context, path, policy),
+                fetch_fn=lambda: self._fetch_and_build_entry(
+                    request, context, path, policy, vary_key
+                ),
+                refresh_fn=lambda: self._fetch_and_build_entry(
+                    request, context, path, policy, vary_key, keep_oversized=False
+                ),
                 ttl_seconds=policy.ttl_seconds if policy else 300,
                 stale_seconds=policy.stale_seconds if policy else 60,
             )
@@ -138,7 +270,7 @@ class GatewayProxy:
                 cache_status = CacheStatus.MISS
 
             # Build response from cache entry
-            response = self._build_response(entry)
+            response = self._build_response(entry, status)
 
             return ProxyResult(
                 response=response,
@@ -155,52 +287,90 @@ class GatewayProxy:
                 status_code=exc.response.status_code,
             )
             cache_metrics.record_miss()
-            response = Response(
-                content=exc.response.content,
-                status_code=exc.response.status_code,
-                headers=dict(exc.response.headers),
-            )
+            upstream = None
+            if exc.claim():
+                response = _streaming_response(exc.response, exc.body_prefix, exc.body_rest)
+                upstream = exc.response
+            elif exc.is_streaming:
+                # Another coalesced request is already streaming this body
+                return await self._fetch_upstream(request, context, path, cache_key)
+            else:
+                response = Response(
+                    content=exc.body_prefix,
+                    status_code=exc.response.status_code,
+                    headers=_response_headers(exc.response.headers),
+                )
             return ProxyResult(
                 response=response,
                 cache_status=CacheStatus.BYPASS,
                 error_type=ErrorType.NONE,
                 upstream_latency_ms=exc.upstream_latency_ms,
                 upstream_status=exc.response.status_code,
+                upstream=upstream,
             )
         except Exception as e:
             logger.error("Cache fetch failed", error=str(e), cache_key=cache_key)
             cache_metrics.record_error()
             return await self._fetch_upstream(request, context, path, cache_key)
 
+    async def _proxy_head(
+        self,
+        request: Request,
+        context: GatewayContext,
+        path: str,
+    ) -> ProxyResult:
+        """Answer HEAD from the GET response so both share one cache entry."""
+        get_request = Request({**request.scope, "method": "GET"}, request.receive)
+        result = await self.proxy_request(get_request, context, path)
+
+        if isinstance(result.response, StreamingResponse):
+            # Release the upstream body instead of relaying it; the body
+            # iterator never started, so closing it would not reach the
+            # upstream response
+            await result.upstream.aclose()
+            result.upstream = None
+            response = Response(status_code=result.response.status_code)
+            response.raw_headers = result.response.raw_headers
+            result.response = response
+        else:
+            # Headers, including Content-Length, describe the GET body
+            result.response.body = b""
+        result.response_size_bytes = 0
+        return result
+
     async def _build_cache_key(
         self,
         request: Request,
         context: GatewayContext,
         path: str,
-    ) -> str:
-        """Build canonical cache key."""
+    ) -> tuple[str, str]:
+        """Build canonical cache key, returned with its vary component."""
         policy = context.route_match.policy
         route = context.route_match.route
 
-        # Parse query params
-        query_params = dict(parse_qs(str(request.query_params)))
+        # Starlette has already parsed the query string; blank values are
+        # skipped as parse_qs did. Keys written before CACHE_FORMAT_VERSION
+        # 2 are intentionally invalidated by that version bump
+        query_items = [(k, v) for k, v in request.query_params.multi_items() if v]
 
         # Get vary headers
         vary_headers = {}
-        if policy and policy.vary_headers:
-            for header in policy.vary_headers:
+        if policy:
+            for header in policy.vary_header_names:
                 value = request.headers.get(header)
                 if value:
-                    vary_headers[header.lower()] = value
+                    vary_headers[header] = value
+        vary_key = CacheKeyBuilder.build_vary_key(vary_headers)
 
-        return CacheKeyBuilder.build(
+        cache_key = CacheKeyBuilder.build(
             method=request.method,
             route_name=route.name,
             path=path,
-            query_params=query_params,
-            vary_headers=vary_headers,
-            tenant_id=context.auth.tenant.id if context.auth.tenant else None,
+            tenant_id=context.auth.tenant_id,
+            query_items=query_items,
+            vary_key=vary_key,
         )
+        return cache_key, vary_key
 
     async def _check_bloom_filter(self, route_name: str, path: str) -> bool:
         """Check if path is likely a 404 via bloom filter."""
@@ -222,21 +392,18 @@ class GatewayProxy:
 
         try:
             start = time.perf_counter()
-            upstream_response = await self._make_upstream_request(request, route, path)
-            latency_ms = int((time.perf_counter() - start) * 1000)
-
-            response = Response(
-                content=upstream_response.content,
-                status_code=upstream_response.status_code,
-                headers=dict(upstream_response.headers),
+            upstream_response = await self._make_upstream_request(
+                request, route, path, stream_body=True
             )
+            latency_ms = int((time.perf_counter() - start) * 1000)
 
             return ProxyResult(
-                response=response,
+                response=_streaming_response(upstream_response),
                 cache_status=CacheStatus.BYPASS,
                 error_type=ErrorType.NONE,
                 upstream_latency_ms=latency_ms,
                 upstream_status=upstream_response.status_code,
+                upstream=upstream_response,
             )
 
         except httpx.TimeoutException:
@@ -266,47 +433,50 @@ class GatewayProxy:
         request: Request,
         context: GatewayContext,
         path: str,
-        policy: CachePolicy | None,
+        policy: PolicySnapshot | None,
+        vary_key: str = "",
+        keep_oversized: bool = True,
     ) -> CacheEntry:
-        """Fetch from upstream and build cache entry."""
+        """
+        Fetch from upstream and build cache entry.
+
+        At most max_body_bytes + 1 bytes are read, whatever the status. A
+        larger body is left open on the raised NonCacheableUpstreamResponse
+        so it can be streamed to the client, or closed unread when
+        keep_oversized is False (background refreshes have no client to
+        stream to).
+        """
         route = context.route_match.route
 
         start = time.perf_counter()
         response = await self._make_upstream_request(request, route, path)
         latency_ms = int((time.perf_counter() - start) * 1000)
 
-        # Check if response is cacheable
-        if policy:
-            if not policy.is_cacheable_status(response.status_code):
-                raise NonCacheableUpstreamResponse(
-                    response=response,
-                    reason="status_not_cacheable",
-                    latency_ms=latency_ms,
-                )
-            if len(response.content) > policy.max_body_bytes:
-                raise NonCacheableUpstreamResponse(
-                    response=response,
-                    reason="body_too_large",
-                    latency_ms=latency_ms,
-                )
+        # Uncacheable statuses are read under the same size limit, so a huge
+        # error body is streamed rather than buffered
+        cacheable = policy is None or policy.is_cacheable_status(response.status_code)
+        body, rest = await _read_limited(response, policy.max_body_bytes if policy else None)
+        if not cacheable or rest is not None:
+            if rest is not None and not keep_oversized:
+                await response.aclose()
+                rest = None
+            raise NonCacheableUpstreamResponse(
+                response=response,
+                reason="body_too_large" if cacheable else "status_not_cacheable",
+                latency_ms=latency_ms,
+                body_prefix=body,
+                body_rest=rest,
+            )
 
         # Record 404s in bloom filter
         if response.status_code == 404:
             await negative_cache.record_404(route.name, path)
 
-        # Build vary key
-        vary_key = ""
-        if policy and policy.vary_headers:
-            vary_parts = []
-            for header in policy.vary_headers:
-                value = request.headers.get(header, "")
-                vary_parts.append(f"{header}:{value}")
-            vary_key = "|".join(vary_parts)
-
+        # Stored pre-filtered so cache hits only append their own headers
         return CacheEntry(
             status_code=response.status_code,
-            headers=dict(response.headers),
-            body=response.content,
+            headers=_response_headers(response.headers),
+            body=body,
             created_at=time.time(),
             ttl_seconds=policy.ttl_seconds if policy else 300,
             stale_seconds=policy.stale_seconds if policy else 60,
@@ -316,10 +486,22 @@ class GatewayProxy:
     async def _make_upstream_request(
         self,
         request: Request,
-        route: Route,
+        route: RouteSnapshot,
         path: str,
+        stream_body: bool = False,
     ) -> httpx.Response:
-        """Make the actual upstream HTTP request."""
+        """
+        Make the actual upstream HTTP request.
+
+        The response is returned once its headers arrive, with the body
+        still unread; callers must read it, stream it, or close it.
+
+        With stream_body the client body is streamed straight to the
+        upstream instead of being read into memory first. Only callers that
+        send the request once may stream; Starlette replays a body that was
+        already buffered, so a later fallback after a buffered attempt is
+        still safe.
+        """
         client = await self.get_client()
 
         # Build upstream URL
@@ -329,64 +511,53 @@ class GatewayProxy:
         if request.query_params:
             upstream_url = f"{upstream_url}?{request.query_params}"
 
-        # Build headers
-        headers = dict(request.headers)
-
-        # Remove hop-by-hop headers
-        hop_by_hop = [
-            "connection", "keep-alive", "proxy-authenticate",
-            "proxy-authorization", "te", "trailers", "transfer-encoding",
-            "upgrade", "host",
-        ]
-        for header in hop_by_hop:
-            headers.pop(header, None)
+        # Filter the raw header pairs without decoding them; headers the
+        # route adds are dropped too so the added values replace them
+        drop = _HOP_BY_HOP_REQUEST_HEADERS
+        if route.request_headers_remove or route.request_headers_add:
+            drop = drop.union(
+                header.lower().encode("latin-1")
+                for header in (*route.request_headers_remove, *route.request_headers_add)
+            )
+        headers = [(k, v) for k, v in request.headers.raw if k not in drop]
 
         # Apply route header transformations
-        if route.request_headers_remove:
-            for header in route.request_headers_remove:
-                headers.pop(header.lower(), None)
-
         if route.request_headers_add:
-            headers.update(route.request_headers_add)
+            headers.extend(route.request_headers_add.items())
 
         # Get request body
-        body = await request.body() if request.method in ("POST", "PUT", "PATCH") else None
+        if request.method in _BODYLESS_METHODS:
+            body = None
+        elif stream_body:
+            body = request.stream()
+        else:
+            body = await request.body()
 
         # Configure timeout
         timeout = route.timeout_ms / 1000
 
         # Make request
-        response = await client.request(
+        upstream_request = client.build_request(
             method=request.method,
             url=upstream_url,
             headers=headers,
             content=body,
             timeout=timeout,
         )
+        return await client.send(upstream_request, stream=True)
 
-        return response
-
-    def _build_response(self, entry: CacheEntry) -> Response:
-        """Build Starlette response from cache entry."""
-        headers = dict(entry.headers)
-
-        # Remove hop-by-hop headers
-        hop_by_hop = [
-            "connection", "keep-alive", "transfer-encoding",
-            "content-encoding", "content-length",
-        ]
-        for header in hop_by_hop:
-            headers.pop(header, None)
-            headers.pop(header.title(), None)
-
-        # Add cache headers
-        headers["X-Cache"] = "HIT" if entry.get_status() == CacheEntryStatus.FRESH else "STALE"
-        headers["Age"] = str(int(entry.age_seconds))
-
+    def _build_response(self, entry: CacheEntry, status: CacheEntryStatus) -> Response:
+        """Build Starlette response from cache entry and its lookup status."""
+        # Entry headers were filtered when stored and have lowercase keys,
+        # so the cache headers replace any upstream values of the same name
         return Response(
             content=entry.body,
             status_code=entry.status_code,
-            headers=headers,
+            headers={
+                **entry.headers,
+                "x-cache": "STALE" if status == CacheEntryStatus.STALE else "HIT",
+                "age": str(int(entry.age_seconds)),
+            },
         )
 
 
@@ -1,18 +1,25 @@
 """Gateway router - matches requests to routes and handles authentication."""
 
+import asyncio
+import hmac
 import re
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from types import MappingProxyType
+from typing import TYPE_CHECKING, NamedTuple
 
 import structlog
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.config import get_settings
 from src.models import ApiKey, BlockRule, CachePolicy, Route, Tenant
-from src.models.api_key import ApiKeyStatus
+from src.models.api_key import ApiKeyStatus, hash_api_key
 from src.services.abuse import AbuseCheckResult, abuse_detector
+from src.services.api_key_usage import api_key_usage
 from src.services.rate_limiter import (
     RateLimitResult,
     quota_manager,
@@ -25,30 +32,144 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+# Fixed for the process lifetime, so read once instead of per request
+_settings = get_settings()
+_ABUSE_DETECTION_ENABLED = _settings.abuse_detection_enabled
+_DEFAULT_RATE_LIMIT_RPS = _settings.default_rate_limit_rps
+_DEFAULT_RATE_LIMIT_BURST = _settings.default_rate_limit_burst
+
+# Authentication reads plain columns; ORM instances are never built for it
+_AUTH_COLUMNS = (
+    ApiKey.id,
+    ApiKey.key,
+    ApiKey.status,
+    ApiKey.expires_at,
+    ApiKey.tenant_id,
+    ApiKey.quota_daily,
+    ApiKey.quota_monthly,
+    ApiKey.rate_limit_rps,
+    ApiKey.rate_limit_burst,
+    Tenant.is_active.label("tenant_active"),
+    BlockRule.id.label("block_id"),
+    BlockRule.reason.label("block_reason"),
+)
+
+
+class AuthenticatedKey(NamedTuple):
+    """The API key fields the gateway reads after authentication."""
+
+    id: str
+    tenant_id: str
+    expires_at: datetime | None
+    quota_daily: int
+    quota_monthly: int
+    rate_limit_rps: float | None
+    rate_limit_burst: int | None
+
+
+class PolicySnapshot(NamedTuple):
+    """The cache policy fields the proxy reads, copied out of the session."""
+
+    id: str
+    ttl_seconds: int
+    stale_seconds: int
+    max_body_bytes: int
+    cache_no_store: bool
+    vary_header_names: tuple[str, ...]
+    cacheable_statuses: frozenset[int]
+
+    @classmethod
+    def from_model(cls, policy: CachePolicy) -> "PolicySnapshot":
+        return cls(
+            id=policy.id,
+            ttl_seconds=policy.ttl_seconds,
+            stale_seconds=policy.stale_seconds,
+            max_body_bytes=policy.max_body_bytes,
+            cache_no_store=policy.cache_no_store,
+            vary_header_names=policy.vary_header_names,
+            cacheable_statuses=policy.cacheable_statuses,
+        )
+
+    def is_cacheable_status(self, status_code: int) -> bool:
+        """Check if a status code is cacheable."""
+        return status_code in self.cacheable_statuses
+
+
+class RouteSnapshot(NamedTuple):
+    """
+    The route fields the gateway reads, copied out of the session.
+
+    Matched routes are cached across requests, so they must not be ORM
+    instances: those expire when their session rolls back and stay tied
+    to the session that loaded them.
+    """
+
+    id: str
+    name: str
+    tenant_id: str | None
+    method_set: frozenset[str]
+    upstream_base_url: str
+    upstream_path_rewrite: str | None
+    timeout_ms: int
+    request_headers_add: Mapping[str, str]
+    request_headers_remove: tuple[str, ...]
+    rate_limit_rps: float | None
+    rate_limit_burst: int | None
+    policy: PolicySnapshot | None
+
+    @classmethod
+    def from_model(cls, route: Route) -> "RouteSnapshot":
+        return cls(
+            id=route.id,
+            name=route.name,
+            tenant_id=route.tenant_id,
+            method_set=route.method_set,
+            upstream_base_url=route.upstream_base_url,
+            upstream_path_rewrite=route.upstream_path_rewrite,
+            timeout_ms=route.timeout_ms,
+            request_headers_add=MappingProxyType(dict(route.request_headers_add or {})),
+            request_headers_remove=tuple(route.request_headers_remove or ()),
+            rate_limit_rps=route.rate_limit_rps,
+            rate_limit_burst=route.rate_limit_burst,
+            policy=route.policy and PolicySnapshot.from_model(route.policy),
+        )
+
+    def matches_method(self, method: str) -> bool:
+        """Check if this route handles the given HTTP method."""
+        return method.upper() in self.method_set
+
+    def get_upstream_url(self, path: str) -> str:
+        """Build the full upstream URL for a given path."""
+        base = self.upstream_base_url.rstrip("/")
+        if self.upstream_path_rewrite:
+            # Simple rewrite: replace the route name portion
+            path = self.upstream_path_rewrite + path
+        return f"{base}{path}"
 
-@dataclass
+
+@dataclass(slots=True)
 class AuthResult:
     """Result of API key authentication."""
 
     authenticated: bool
-    api_key: ApiKey | None = None
-    tenant: Tenant | None = None
+    api_key: AuthenticatedKey | None = None
+    tenant_id: str | None = None
     error: str | None = None
     error_code: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteMatch:
     """Result of route matching."""
 
     matched: bool
-    route: Route | None = None
-    policy: CachePolicy | None = None
+    route: RouteSnapshot | None = None
+    policy: PolicySnapshot | None = None
     path_remainder: str = ""
     error: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GatewayContext:
     """Full context for a gateway request."""
 
@@ -73,31 +194,71 @@ class GatewayRouter:
 
     API_KEY_HEADER = "X-API-Key"
 
-    def __init__(self, db: AsyncSession) -> None:
-        self._db = db
-        self._route_cache: dict[str, Route] = {}
+    # Bounds memory when clients probe many distinct bogus route names
+    UNKNOWN_ROUTE_CACHE_SIZE = 10000
+    AUTH_CACHE_SIZE = 10000
+    ROUTE_CACHE_SIZE = 1024
+
+    def __init__(self) -> None:
+        settings = get_settings()
+
+        # Successful authentications by raw key, so hot keys skip the key
+        # and block rule queries; admin key/tenant changes clear it
+        self._auth_cache: TTLCache[str, AuthResult] = TTLCache(
+            maxsize=self.AUTH_CACHE_SIZE,
+            ttl=settings.api_key_cache_seconds,
+        )
+        # Lookups in progress, shared by concurrent requests for the same key
+        self._auth_inflight: dict[str, asyncio.Future[AuthResult | None]] = {}
+
+        # Snapshots of active routes by name, taken with their cache policy,
+        # so matching skips the route query; admin route and policy changes
+        # clear it
+        self._routes: TTLCache[str, RouteSnapshot] = TTLCache(
+            maxsize=self.ROUTE_CACHE_SIZE,
+            ttl=settings.route_cache_seconds,
+        )
+        # Route names that matched no active route, so repeated requests for
+        # them are answered without a database round trip
+        self._unknown_routes: TTLCache[str, bool] = TTLCache(
+            maxsize=self.UNKNOWN_ROUTE_CACHE_SIZE,
+            ttl=settings.unknown_route_cache_seconds,
+        )
+
+    def forget_api_keys(self) -> None:
+        """Drop cached authentications after an API key or tenant changes."""
+        self._auth_cache.clear()
+
+    def forget_routes(self) -> None:
+        """Drop cached routes and unknown names after a route or policy changes."""
+        self._routes.clear()
+        self._unknown_routes.clear()
 
     async def process_request(
         self,
+        db: AsyncSession,
         route_name: str,
         path: str,
         method: str,
         api_key_header: str | None,
+        now: datetime | None = None,
     ) -> GatewayContext:
         """
         Process a gateway request through all checks.
         
         Args:
+            db: Request-scoped database session
             route_name: Name of the route from URL
             path: Path after route name
             method: HTTP method
             api_key_header: Value of X-API-Key header
+            now: When the request arrived (defaults to the current time)
         
         Returns:
             GatewayContext with all check results
         """
         # Step 1: Authenticate API key
-        auth = await self.authenticate(api_key_header)
+        auth = await self.authenticate(db, api_key_header, now)
         if not auth.authenticated:
             return GatewayContext(
                 auth=auth,
@@ -106,15 +267,19 @@ class GatewayRouter:
 
         # Step 2: Match route
         route_match = await self.match_route(
+            db,
             route_name,
             method,
-            auth.tenant.id if auth.tenant else None,
+            auth.tenant_id,
         )
         if not route_match.matched:
             return GatewayContext(auth=auth, route_match=route_match)
 
         # Step 3: Check abuse status
-        abuse_check = await abuse_detector.check_abuse(auth.api_key.id)
+        if _ABUSE_DETECTION_ENABLED:
+            abuse_check = await abuse_detector.check_abuse(auth.api_key.id)
+        else:
+            abuse_check = AbuseCheckResult()
         if abuse_check.is_blocked:
             return GatewayContext(
                 auth=auth,
@@ -162,12 +327,19 @@ class GatewayRouter:
             quota_error=quota_error,
         )
 
-    async def authenticate(self, api_key_header: str | None) -> AuthResult:
+    async def authenticate(
+        self,
+        db: AsyncSession,
+        api_key_header: str | None,
+        now: datetime | None = None,
+    ) -> AuthResult:
         """
         Authenticate request using API key.
         
         Args:
+            db: Request-scoped database session
             api_key_header: Value of X-API-Key header
+            now: When the request arrived (defaults to the current time)
         
         Returns:
             AuthResult with authentication status
@@ -179,16 +351,72 @@ class GatewayRouter:
                 error_code="missing_api_key",
             )
 
-        # Look up API key
+        now = now or datetime.now(timezone.utc)
+        auth = self._auth_cache.get(api_key_header)
+        if auth is None:
+            auth = await self._lookup_coalesced(db, api_key_header, now)
+            if not auth.authenticated:
+                return auth
+        elif auth.api_key.expires_at and auth.api_key.expires_at < now:
+            # Keys can expire while cached
+            del self._auth_cache[api_key_header]
+            return AuthResult(
+                authenticated=False,
+                error="API key has expired",
+                error_code="key_expired",
+            )
+
+        await api_key_usage.touch(auth.api_key.id)
+        return auth
+
+    async def _lookup_coalesced(
+        self, db: AsyncSession, api_key_header: str, now: datetime
+    ) -> AuthResult:
+        """Look up a key once for all concurrent requests that present it."""
+        inflight = self._auth_inflight.get(api_key_header)
+        if inflight is not None:
+            auth = await asyncio.shield(inflight)
+            # None means the leading lookup failed; try again on our session
+            return (
+                auth if auth is not None else await self._lookup_api_key(db, api_key_header, now)
+            )
+
+        future: asyncio.Future[AuthResult | None] = asyncio.get_running_loop().create_future()
+        self._auth_inflight[api_key_header] = future
+        auth = None
+        try:
+            auth = await self._lookup_api_key(db, api_key_header, now)
+            if auth.authenticated:
+                self._auth_cache[api_key_header] = auth
+            return auth
+        finally:
+            del self._auth_inflight[api_key_header]
+            future.set_result(auth)
+
+    async def _lookup_api_key(
+        self, db: AsyncSession, api_key_header: str, now: datetime
+    ) -> AuthResult:
+        """Load a key with its tenant and run every status check against the database."""
+        # One round trip: the key, its tenant, and any active block rule
         query = (
-            select(ApiKey)
-            .options(selectinload(ApiKey.tenant))
-            .where(ApiKey.key == api_key_header)
+            select(*_AUTH_COLUMNS)
+            .join(Tenant, Tenant.id == ApiKey.tenant_id)
+            .outerjoin(
+                BlockRule,
+                and_(
+                    BlockRule.api_key_id == ApiKey.id,
+                    BlockRule.unblocked_at.is_(None),
+                    or_(BlockRule.blocked_until.is_(None), BlockRule.blocked_until > now),
+                ),
+            )
+            .where(ApiKey.key_hash == hash_api_key(api_key_header))
+            .limit(1)
         )
-        result = await self._db.execute(query)
-        api_key = result.scalar_one_or_none()
+        result = await db.execute(query)
+        row = result.first()
 
-        if not api_key:
+        # The digest only narrows the lookup; the key itself must still match
+        if not row or not hmac.compare_digest(row.key.encode(), api_key_header.encode()):
             logger.warning("Invalid API key attempted", key_prefix=api_key_header[:10])
             return AuthResult(
                 authenticated=False,
@@ -197,16 +425,16 @@ class GatewayRouter:
             )
 
         # Check key status
-        if api_key.status != ApiKeyStatus.ACTIVE:
+        if row.status != ApiKeyStatus.ACTIVE:
             return AuthResult(
                 authenticated=False,
-                error=f"API key is {api_key.status}",
+                error=f"API key is {row.status}",
                 error_code="key_inactive",
             )
 
         # Check expiration
-        if api_key.expires_at:
-            if api_key.expires_at < datetime.now(timezone.utc):
+        if row.expires_at:
+            if row.expires_at < now:
                 return AuthResult(
                     authenticated=False,
                     error="API key has expired",
@@ -214,7 +442,7 @@ class GatewayRouter:
                 )
 
         # Check tenant status
-        if not api_key.tenant.is_active:
+        if not row.tenant_active:
             return AuthResult(
                 authenticated=False,
                 error="Tenant is inactive",
@@ -222,36 +450,30 @@ class GatewayRouter:
             )
 
         # Check for active blocks
-        block_query = (
-            select(BlockRule)
-            .where(BlockRule.api_key_id == api_key.id)
-            .where(BlockRule.unblocked_at.is_(None))
-            .where(
-                (BlockRule.blocked_until.is_(None)) |
-                (BlockRule.blocked_until > datetime.now(timezone.utc))
-            )
-        )
-        block_result = await self._db.execute(block_query)
-        active_block = block_result.scalar_one_or_none()
-
-        if active_block:
+        if row.block_id is not None:
             return AuthResult(
                 authenticated=False,
-                error=f"API key is blocked: {active_block.reason}",
+                error=f"API key is blocked: {row.block_reason}",
                 error_code="key_blocked",
             )
 
-        # Update last used timestamp
-        api_key.last_used_at = datetime.now(timezone.utc)
-
         return AuthResult(
             authenticated=True,
-            api_key=api_key,
-            tenant=api_key.tenant,
+            api_key=AuthenticatedKey(
+                id=row.id,
+                tenant_id=row.tenant_id,
+                expires_at=row.expires_at,
+                quota_daily=row.quota_daily,
+                quota_monthly=row.quota_monthly,
+                rate_limit_rps=row.rate_limit_rps,
+                rate_limit_burst=row.rate_limit_burst,
+            ),
+            tenant_id=row.tenant_id,
         )
 
     async def match_route(
         self,
+        db: AsyncSession,
         route_name: str,
         method: str,
         tenant_id: str | None,
@@ -260,11 +482,12 @@ class GatewayRouter:
         Match a request to a configured route.
         
         Routes are matched by:
-        1. Route name (exact match)
+        1. Route name (exact match; names are unique)
         2. HTTP method
-        3. Tenant (tenant-specific routes take priority over shared)
+        3. Tenant (the route is shared or belongs to the caller's tenant)
         
         Args:
+            db: Request-scoped database session
             route_name: Name from URL path
             method: HTTP method
             tenant_id: Authenticated tenant ID
@@ -272,41 +495,34 @@ class GatewayRouter:
         Returns:
             RouteMatch with matched route or error
         """
-        # Query for routes matching the name
-        query = (
-            select(Route)
-            .options(selectinload(Route.policy))
-            .where(Route.name == route_name)
-            .where(Route.is_active.is_(True))
-            .order_by(Route.priority.desc())
-        )
-        result = await self._db.execute(query)
-        routes = result.scalars().all()
+        route = self._routes.get(route_name)
+        if route is None:
+            if route_name in self._unknown_routes:
+                return RouteMatch(
+                    matched=False,
+                    error=f"Route '{route_name}' not found",
+                )
 
-        if not routes:
-            return RouteMatch(
-                matched=False,
-                error=f"Route '{route_name}' not found",
+            # Route names are unique, so the name's index yields at most one row
+            query = (
+                select(Route)
+                .options(selectinload(Route.policy))
+                .where(Route.name == route_name)
+                .where(Route.is_active.is_(True))
             )
+            result = await db.execute(query)
+            model = result.scalar_one_or_none()
+
+            if model is None:
+                self._unknown_routes[route_name] = True
+                return RouteMatch(
+                    matched=False,
+                    error=f"Route '{route_name}' not found",
+                )
+            route = self._routes[route_name] = RouteSnapshot.from_model(model)
 
-        # Find best match (tenant-specific > shared)
-        matched_route: Route | None = None
-
-        for route in routes:
-            # Check method
-            if not route.matches_method(method):
-                continue
-
-            # Prefer tenant-specific route
-            if route.tenant_id == tenant_id:
-                matched_route = route
-                break
-
-            # Fall back to shared route
-            if route.tenant_id is None and matched_route is None:
-                matched_route = route
-
-        if not matched_route:
+        # The route must take the method and be shared or the tenant's own
+        if not route.matches_method(method) or route.tenant_id not in (None, tenant_id):
             return RouteMatch(
                 matched=False,
                 error=f"Route '{route_name}' does not support method {method}",
@@ -314,35 +530,31 @@ class GatewayRouter:
 
         return RouteMatch(
             matched=True,
-            route=matched_route,
-            policy=matched_route.policy,
+            route=route,
+            policy=route.policy,
         )
 
-    def _get_rate_limit(self, api_key: ApiKey, route: Route) -> float:
+    def _get_rate_limit(self, api_key: AuthenticatedKey, route: RouteSnapshot) -> float:
         """Get effective rate limit (key override > route > default)."""
-        from src.config import get_settings
-
-        settings = get_settings()
-
         if api_key.rate_limit_rps is not None:
             return api_key.rate_limit_rps
         if route.rate_limit_rps is not None:
             return route.rate_limit_rps
-        return settings.default_rate_limit_rps
+        return _DEFAULT_RATE_LIMIT_RPS
 
-    def _get_burst_limit(self, api_key: ApiKey, route: Route) -> int:
+    def _get_burst_limit(self, api_key: AuthenticatedKey, route: RouteSnapshot) -> int:
         """Get effective burst limit (key override > route > default)."""
-        from src.config import get_settings
-
-        settings = get_settings()
-
         if api_key.rate_limit_burst is not None:
             return api_key.rate_limit_burst
         if route.rate_limit_burst is not None:
             return route.rate_limit_burst
-        return settings.default_rate_limit_burst
+        return _DEFAULT_RATE_LIMIT_BURST
+
+
+# Global router instance
+gateway_router = GatewayRouter()
 
 
-async def get_gateway_router(db: AsyncSession) -> GatewayRouter:
+async def get_gateway_router() -> GatewayRouter:
     """Dependency to get gateway router."""
-    return GatewayRouter(db)
+    return gateway_router
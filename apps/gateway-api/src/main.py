@@ -1,12 +1,15 @@
 """Main FastAPI application entry point."""
 
+import asyncio
 import logging
+import sys
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src import __version__
 from src.api.admin import router as admin_router
@@ -16,9 +19,12 @@ from src.api.health import router as health_router
 from src.config import get_settings
 from src.database import close_db, get_db_context, init_db
 from src.gateway.proxy import gateway_proxy
-from src.middleware.logging import LoggingMiddleware, setup_logging
+from src.middleware.logging import LoggingMiddleware, log_listener, setup_logging
 from src.middleware.request_id import RequestIdMiddleware
+from src.services.abuse import abuse_detector
+from src.services.api_key_usage import api_key_usage
 from src.services.redis_client import redis_client
+from src.services.request_log_writer import request_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     
     # Startup
     setup_logging()
+    log_listener.start()
+
+    # uvloop is a dependency everywhere but Windows; surface a silent fallback
+    loop = asyncio.get_running_loop()
+    if sys.platform != "win32" and not type(loop).__module__.startswith("uvloop"):
+        logger.warning(
+            f"Running on {type(loop).__name__} instead of uvloop; "
+            "start uvicorn with --loop uvloop"
+        )
+
+    # Run tasks eagerly so coroutines that never suspend skip a loop step
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        loop.set_task_factory(asyncio.eager_task_factory)
     
     # Connect to Redis
     await redis_client.connect()
@@ -37,6 +56,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Initialize database (create tables if needed)
     await init_db()
     
+    # Start the batched request log, key usage and abuse counter writers
+    request_log_writer.start()
+    api_key_usage.start()
+    if settings.abuse_detection_enabled:
+        abuse_detector.start()
+
     # Auto-seed database if enabled
     if settings.auto_seed:
         from src.seed import seed_database
@@ -48,9 +73,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     yield
     
     # Shutdown
+    await request_log_writer.stop()
+    await api_key_usage.stop()
+    await abuse_detector.stop()
     await gateway_proxy.close()
     await redis_client.disconnect()
     await close_db()
+    log_listener.stop()
 
 
 def create_app() -> FastAPI:
@@ -62,6 +91,7 @@ def create_app() -> FastAPI:
         description="Production-grade API Gateway with caching, rate limiting, and abuse detection",
         version=__version__,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
     )
@@ -74,6 +104,9 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+
+    # Compress large JSON bodies; responses already encoded upstream pass through
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
     
     # Add custom middleware (order matters - first added is outermost)
     app.add_middleware(LoggingMiddleware)
@@ -100,6 +133,7 @@ if __name__ == "__main__":
         "src.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
         reload=settings.debug,
         log_level=settings.log_level.lower(),
     )
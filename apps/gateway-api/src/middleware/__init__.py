@@ -1,10 +1,11 @@
 """Middleware components for the gateway."""
 
-from src.middleware.logging import LoggingMiddleware, setup_logging
+from src.middleware.logging import LoggingMiddleware, get_client_ip, setup_logging
 from src.middleware.request_id import RequestIdMiddleware
 
 __all__ = [
     "RequestIdMiddleware",
     "LoggingMiddleware",
     "setup_logging",
+    "get_client_ip",
 ]
@@ -1,19 +1,26 @@
 """Structured logging middleware and configuration."""
 
+import contextlib
 import logging
+import queue
 import sys
 import time
 from collections.abc import Callable
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+import orjson
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import get_settings
 from src.middleware.request_id import get_request_id
 
+# Lazy proxy; it binds to the configured logger on first use and keeps it
+logger = structlog.get_logger(__name__)
+
 
 def setup_logging() -> None:
     """Configure structured logging for the application."""
@@ -22,6 +29,13 @@ def setup_logging() -> None:
     # Determine log level
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
+    # Render through stdlib logging so log_listener can move the writes off
+    # the event loop; production logs are serialized by orjson
+    if settings.debug:
+        renderer = structlog.dev.ConsoleRenderer()
+    else:
+        renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+
     # Configure structlog
     structlog.configure(
         processors=[
@@ -31,11 +45,11 @@ def setup_logging() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             add_request_id,
-            structlog.processors.JSONRenderer() if not settings.debug else structlog.dev.ConsoleRenderer(),
+            renderer,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
@@ -47,6 +61,53 @@ def setup_logging() -> None:
     )
 
 
+def _orjson_dumps(obj: Any, default: Callable[[Any], Any] | None = None) -> str:
+    # Stdlib json coerced non-str keys, so keep accepting them
+    return orjson.dumps(
+        obj, default=default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+    ).decode()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with contextlib.suppress(queue.Full):
+            self.queue.put_nowait(record)
+
+
+class LogListener:
+    """
+    Moves log output off the event loop.
+
+    While started, the root logger's handlers run on a QueueListener thread
+    and request handling only puts records on a bounded queue; records
+    arriving while the queue is full are dropped. Before start() and after
+    stop() the handlers write directly, as configured by setup_logging.
+    """
+
+    def __init__(self) -> None:
+        self._listener: QueueListener | None = None
+
+    def start(self) -> None:
+        """Hand the root logger's handlers to a background thread."""
+        if self._listener is not None:
+            return
+        root = logging.getLogger()
+        log_queue: queue.Queue = queue.Queue(maxsize=get_settings().log_queue_size)
+        self._listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+        root.handlers = [_DroppingQueueHandler(log_queue)]
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Write queued records and give the handlers back to the root logger."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        logging.getLogger().handlers = list(self._listener.handlers)
+        self._listener = None
+
+
 def add_request_id(
     logger: Any,
     method_name: str,
@@ -59,7 +120,52 @@ def add_request_id(
     return event_dict
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+def get_client_ip(request: Request) -> str:
+    """
+    Get the client IP for a request, considering proxies.
+
+    Resolved once and stored on request.state, so the logging middleware and
+    the gateway handler share a single lookup.
+    """
+    return _client_ip_from_scope(request.scope)
+
+
+def _client_ip_from_scope(scope: Scope) -> str:
+    """Resolve the client IP for an ASGI scope, caching it in the scope state."""
+    state = scope.setdefault("state", {})
+    client_ip = state.get("client_ip")
+    if client_ip is not None:
+        return client_ip
+
+    # Look for both proxy headers in one pass, keeping the first occurrence;
+    # a non-empty X-Forwarded-For wins, so the scan stops once it is found
+    forwarded_for = real_ip = None
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for" and forwarded_for is None:
+            forwarded_for = value
+            if value:
+                break
+        if name == b"x-real-ip" and real_ip is None:
+            real_ip = value
+
+    # Check X-Forwarded-For header (for proxied requests), taking the first
+    # IP in the chain without splitting the whole list
+    if forwarded_for:
+        client_ip = forwarded_for.partition(b",")[0].strip().decode("latin-1")
+    else:
+        # Check X-Real-IP header, then fall back to direct client IP
+        client = scope.get("client")
+        client_ip = (
+            (real_ip and real_ip.decode("latin-1"))
+            or (client[0] if client else None)
+            or "unknown"
+        )
+
+    state["client_ip"] = client_ip
+    return client_ip
+
+
+class LoggingMiddleware:
     """
     Middleware that logs request/response information.
     
@@ -68,47 +174,49 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     - Response status code
     - Request duration
     - Cache hit/miss status (if available)
+
+    Implemented as plain ASGI middleware so requests are not wrapped in
+    Request/Response objects or run in an extra task.
     """
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log metrics."""
-        logger = structlog.get_logger(__name__)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Extract request info
-        method = request.method
-        path = request.url.path
-        client_ip = self._get_client_ip(request)
+        method = scope["method"]
+        path = scope["path"]
+        client_ip = _client_ip_from_scope(scope)
 
         # Track timing
         start_time = time.perf_counter()
 
-        try:
-            response = await call_next(request)
-            duration_ms = (time.perf_counter() - start_time) * 1000
-
-            # Get cache status if available
-            cache_status = getattr(request.state, "cache_status", None)
-
-            # Log request completion
-            logger.info(
-                "request_completed",
-                method=method,
-                path=path,
-                status_code=response.status_code,
-                duration_ms=round(duration_ms, 2),
-                client_ip=client_ip,
-                cache_status=cache_status,
-            )
-
-            # Add timing header
-            response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
-
-            return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter() - start_time) * 1000
+
+                # Log request completion, with the cache status if available
+                logger.info(
+                    "request_completed",
+                    method=method,
+                    path=path,
+                    status_code=message["status"],
+                    duration_ms=round(duration_ms, 2),
+                    client_ip=client_ip,
+                    cache_status=scope["state"].get("cache_status"),
+                )
+
+                # Add timing header, replacing any the upstream sent
+                MutableHeaders(scope=message)["x-response-time"] = f"{duration_ms:.2f}ms"
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             duration_ms = (time.perf_counter() - start_time) * 1000
             logger.error(
@@ -122,21 +230,6 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             )
             raise
 
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request, considering proxies."""
-        # Check X-Forwarded-For header (for proxied requests)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            # Take the first IP in the chain
-            return forwarded_for.split(",")[0].strip()
-
-        # Check X-Real-IP header
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-
-        # Fall back to direct client IP
-        if request.client:
-            return request.client.host
 
-        return "unknown"
+# Global instance
+log_listener = LogListener()
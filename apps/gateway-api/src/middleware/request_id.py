@@ -1,12 +1,10 @@
 """Request ID middleware for request tracing."""
 
 import uuid
-from collections.abc import Callable
 from contextvars import ContextVar
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Context variable for request ID
 request_id_ctx: ContextVar[str] = ContextVar("request_id", default="")
@@ -17,27 +15,36 @@ def get_request_id() -> str:
     return request_id_ctx.get()
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
+class RequestIdMiddleware:
     """
     Middleware that adds a unique request ID to each request.
-    
+
     The request ID is:
     - Taken from X-Request-Id header if provided
     - Generated as a UUID if not provided
     - Added to the response as X-Request-Id header
     - Made available via context variable for logging
+
+    Implemented as plain ASGI middleware so requests are not wrapped in
+    Request/Response objects or run in an extra task.
     """
 
     HEADER_NAME = "X-Request-Id"
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and add request ID."""
-        # Get or generate request ID
-        request_id = request.headers.get(self.HEADER_NAME)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Get or generate request ID, keeping the first header if repeated
+        request_id = next(
+            (value for name, value in scope["headers"] if name == b"x-request-id"),
+            b"",
+        ).decode("latin-1")
         if not request_id:
             request_id = str(uuid.uuid4())
 
@@ -45,12 +52,15 @@ class RequestIdMiddleware(BaseHTTPMiddleware):
         token = request_id_ctx.set(request_id)
 
         # Store in request state for handlers
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response
+                MutableHeaders(scope=message)[self.HEADER_NAME] = request_id
+            await send(message)
 
         try:
-            response = await call_next(request)
-            # Add request ID to response
-            response.headers[self.HEADER_NAME] = request_id
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
             request_id_ctx.reset(token)
@@ -3,7 +3,7 @@
 from src.models.api_key import ApiKey
 from src.models.block_rule import BlockRule
 from src.models.cache_policy import CachePolicy
-from src.models.request_log import RequestLog
+from src.models.request_log import RequestLog, RequestLogRollup
 from src.models.route import Route
 from src.models.tenant import Tenant
 
@@ -13,5 +13,6 @@ __all__ = [
     "Route",
     "CachePolicy",
     "RequestLog",
+    "RequestLogRollup",
     "BlockRule",
 ]
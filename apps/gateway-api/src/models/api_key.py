@@ -1,12 +1,15 @@
 """API Key model - authentication tokens for tenants."""
 
-import secrets
+import base64
+import hashlib
+import os
+from collections import deque
 from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,9 +30,40 @@ class ApiKeyStatus(str, Enum):
     EXPIRED = "expired"
 
 
+_KEY_BYTES = 32
+_KEY_POOL_SIZE = 64
+_key_pool: deque[str] = deque()
+
+# A forked worker must never hand out keys pre-generated by its parent.
+os.register_at_fork(after_in_child=_key_pool.clear)
+
+
+def _refill_key_pool() -> None:
+    """Draw entropy for a batch of keys with a single urandom call."""
+    entropy = os.urandom(_KEY_BYTES * _KEY_POOL_SIZE)
+    _key_pool.extend(
+        base64.urlsafe_b64encode(entropy[i : i + _KEY_BYTES]).rstrip(b"=").decode("ascii")
+        for i in range(0, len(entropy), _KEY_BYTES)
+    )
+
+
 def generate_api_key() -> str:
     """Generate a secure API key with prefix."""
-    return f"hx_{secrets.token_urlsafe(32)}"
+    try:
+        token = _key_pool.popleft()
+    except IndexError:
+        _refill_key_pool()
+        token = _key_pool.popleft()
+    return f"hx_{token}"
+
+
+def hash_api_key(key: str) -> bytes:
+    """
+    Fixed-width lookup digest of an API key: the first 16 bytes of SHA-256.
+
+    Migration 007 backfills existing rows with the same expression in SQL.
+    """
+    return hashlib.sha256(key.encode()).digest()[:16]
 
 
 class ApiKey(Base):
@@ -60,6 +94,13 @@ class ApiKey(Base):
         index=True,
         default=generate_api_key,
     )
+    # Authentication looks keys up by this digest, see hash_api_key
+    key_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(16),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
     key_prefix: Mapped[str] = mapped_column(
         String(10),
         nullable=False,
@@ -111,10 +152,12 @@ class ApiKey(Base):
     )
 
     def __init__(self, **kwargs: object) -> None:
-        """Initialize API key with auto-generated key prefix."""
+        """Initialize API key with its derived prefix and lookup hash."""
         super().__init__(**kwargs)
         if self.key and not self.key_prefix:
             self.key_prefix = self.key[:10]
+        if self.key and not self.key_hash:
+            self.key_hash = hash_api_key(self.key)
 
     @property
     def is_active(self) -> bool:
@@ -1,10 +1,11 @@
 """Cache Policy model - defines caching behavior for routes."""
 
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy import DateTime, Integer, String, event, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -81,10 +82,15 @@ class CachePolicy(Base):
         """Get vary headers as a list."""
         return self.vary_headers_json or []
 
-    @property
-    def cacheable_statuses(self) -> set[int]:
-        """Get cacheable statuses as a set."""
-        return set(self.cacheable_statuses_json or [200])
+    @cached_property
+    def vary_header_names(self) -> tuple[str, ...]:
+        """Vary headers lowercased once per loaded policy."""
+        return tuple(header.lower() for header in self.vary_headers)
+
+    @cached_property
+    def cacheable_statuses(self) -> frozenset[int]:
+        """Cacheable statuses as a set, built once per loaded policy."""
+        return frozenset(self.cacheable_statuses_json or (200,))
 
     def is_cacheable_status(self, status_code: int) -> bool:
         """Check if a status code is cacheable."""
@@ -92,3 +98,11 @@ class CachePolicy(Base):
 
     def __repr__(self) -> str:
         return f"<CachePolicy(id={self.id}, name={self.name}, ttl={self.ttl_seconds}s)>"
+
+
+@event.listens_for(CachePolicy, "refresh")
+@event.listens_for(CachePolicy, "expire")
+def _forget_derived(policy: CachePolicy, *args: Any) -> None:
+    """Drop values derived from the JSON columns when they are reloaded."""
+    policy.__dict__.pop("vary_header_names", None)
+    policy.__dict__.pop("cacheable_statuses", None)
@@ -5,7 +5,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -64,7 +64,6 @@ class RequestLog(Base):
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        index=True,
     )
 
     # Associations
@@ -72,19 +71,16 @@ class RequestLog(Base):
         UUID(as_uuid=False),
         ForeignKey("tenants.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     api_key_id: Mapped[str | None] = mapped_column(
         UUID(as_uuid=False),
         ForeignKey("api_keys.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     route_id: Mapped[str | None] = mapped_column(
         UUID(as_uuid=False),
         ForeignKey("routes.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
 
     # Request details
@@ -136,3 +132,83 @@ class RequestLog(Base):
             f"<RequestLog(id={self.id}, path={self.path}, "
             f"status={self.status_code}, cache={self.cache_status})>"
         )
+
+
+# Analytics queries filter by (entity, time window); see alembic revision 002.
+Index("ix_request_logs_tenant_time", RequestLog.tenant_id, RequestLog.timestamp.desc())
+Index("ix_request_logs_apikey_time", RequestLog.api_key_id, RequestLog.timestamp.desc())
+Index("ix_request_logs_route_time", RequestLog.route_id, RequestLog.timestamp.desc())
+Index("ix_request_logs_ts_brin", RequestLog.timestamp, postgresql_using="brin")
+Index(
+    "ix_request_logs_miss_time",
+    RequestLog.timestamp,
+    postgresql_where=text("cache_status = 'miss'"),
+)
+# Log pages filtered to cache hits; see revision 006.
+Index(
+    "ix_request_logs_cached_time",
+    RequestLog.timestamp.desc(),
+    RequestLog.id.desc(),
+    postgresql_where=text("cache_status IN ('hit', 'stale')"),
+)
+
+# Covering indexes so window aggregates can run as index-only scans; see revision 003.
+Index(
+    "ix_request_logs_ts_key",
+    RequestLog.timestamp.desc(),
+    RequestLog.api_key_id,
+    postgresql_include=["latency_ms", "error_type", "cache_status"],
+)
+Index(
+    "ix_request_logs_ts_route_cache",
+    RequestLog.timestamp.desc(),
+    RequestLog.route_id,
+    postgresql_include=["api_key_id", "latency_ms", "error_type", "cache_status"],
+)
+
+
+class RequestLogRollup(Base):
+    """
+    Per-minute request counters for one (route, API key) pair.
+
+    Maintained alongside request_logs on ingest so analytics can sum a few
+    rows per minute instead of aggregating every logged request. The
+    dimensions are plain columns rather than foreign keys: rollups outlive
+    the keys and routes they count.
+    """
+
+    __tablename__ = "request_log_rollups"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    minute: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    route_id: Mapped[str | None] = mapped_column(UUID(as_uuid=False), nullable=True)
+    api_key_id: Mapped[str | None] = mapped_column(UUID(as_uuid=False), nullable=True)
+
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    miss_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    stale_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        # Upsert target; NULL route/key must still collapse into one bucket
+        Index(
+            "ix_request_log_rollups_bucket",
+            "minute",
+            "route_id",
+            "api_key_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestLogRollup(minute={self.minute}, route={self.route_id}, "
+            f"key={self.api_key_id}, count={self.request_count})>"
+        )
@@ -1,10 +1,11 @@
 """Route model - defines gateway routing rules."""
 
 from datetime import datetime
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, event, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,7 +31,7 @@ class Route(Base):
         primary_key=True,
         default=lambda: str(uuid4()),
     )
-    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     description: Mapped[str | None] = mapped_column(String(1000), nullable=True)
 
     # Tenant association (null = shared route available to all)
@@ -114,9 +115,14 @@ class Route(Base):
         cascade="all, delete-orphan",
     )
 
+    @cached_property
+    def method_set(self) -> frozenset[str]:
+        """Allowed methods uppercased once per loaded route."""
+        return frozenset(m.upper() for m in self.methods or ())
+
     def matches_method(self, method: str) -> bool:
         """Check if this route handles the given HTTP method."""
-        return method.upper() in [m.upper() for m in (self.methods or [])]
+        return method.upper() in self.method_set
 
     def get_upstream_url(self, path: str) -> str:
         """Build the full upstream URL for a given path."""
@@ -128,3 +134,10 @@ class Route(Base):
 
     def __repr__(self) -> str:
         return f"<Route(id={self.id}, name={self.name}, pattern={self.path_pattern})>"
+
+
+@event.listens_for(Route, "refresh")
+@event.listens_for(Route, "expire")
+def _forget_derived(route: Route, *args: Any) -> None:
+    """Drop the method set when the route's columns are reloaded."""
+    route.__dict__.pop("method_set", None)
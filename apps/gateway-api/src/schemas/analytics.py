@@ -133,10 +133,11 @@ class RequestLogsResponse(BaseModel):
     """Paginated request logs response."""
 
     items: list[RequestLogItem]
-    total: int
+    total: int | None = Field(description="Matching rows; not counted for cursor pages")
     page: int
     page_size: int
     has_more: bool
+    next_cursor: str | None = Field(None, description="Cursor for the following page")
 
 
 class TimeSeriesPoint(BaseModel):
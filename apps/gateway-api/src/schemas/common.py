@@ -52,3 +52,6 @@ class MetricsResponse(BaseModel):
     latency_p50_ms: float = 0.0
     latency_p95_ms: float = 0.0
     latency_p99_ms: float = 0.0
+    db_pool_size: int = 0
+    db_pool_checked_out: int = 0
+    db_pool_overflow: int = 0
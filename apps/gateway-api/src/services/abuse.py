@@ -5,8 +5,11 @@ Monitors request patterns per API key and automatically applies
 soft blocks when anomalous behavior is detected.
 """
 
+import asyncio
+import contextlib
 import math
 import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
@@ -41,7 +44,7 @@ class AbuseMetrics:
     window_errors: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class AbuseCheckResult:
     """Result of an abuse check."""
 
@@ -191,6 +194,60 @@ class AbuseDetector:
         self._z_threshold = z_threshold or settings.abuse_zscore_threshold
         self._block_duration = block_duration or settings.abuse_block_duration_seconds
 
+        # [requests, errors] per API key awaiting the next flush
+        self._pending: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+        self._flush_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start periodically flushing tracked requests on the running event loop."""
+        if self._flush_task is not None:
+            return
+        interval = get_settings().abuse_flush_interval_seconds
+        self._flush_task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop the flush task and record whatever is still pending."""
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._flush_task
+        self._flush_task = None
+        await self.flush()
+
+    async def track_request(self, api_key_id: str, is_error: bool = False) -> None:
+        """
+        Count a request towards the next flush.
+
+        Requests from the same key between flushes are recorded together,
+        so the Redis round trips are paid per key per interval instead of
+        per request. Without a running flush task (the app was used outside
+        its lifespan) the request is recorded immediately instead.
+        """
+        if self._flush_task is None:
+            await self.record_request(api_key_id, is_error=is_error)
+            return
+        counts = self._pending[api_key_id]
+        counts[0] += 1
+        counts[1] += is_error
+
+    async def flush(self) -> None:
+        """Record all tracked requests, one update per API key."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(lambda: [0, 0])
+        await asyncio.gather(
+            *(self._record(key, requests, errors) for key, (requests, errors) in pending.items())
+        )
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush abuse counters")
+
     async def record_request(
         self,
         api_key_id: str,
@@ -210,6 +267,10 @@ class AbuseDetector:
         Returns:
             AbuseCheckResult with block status and recommendations
         """
+        return await self._record(api_key_id, 1, 1 if is_error else 0)
+
+    async def _record(self, api_key_id: str, requests: int, errors: int) -> AbuseCheckResult:
+        """Add a number of requests and errors to a key's metrics and check for abuse."""
         now = time.time()
         metrics_key = f"{self.PREFIX_METRICS}{api_key_id}"
 
@@ -270,11 +331,10 @@ class AbuseDetector:
             metrics.window_errors = 0
 
         # Increment counters
-        metrics.window_requests += 1
-        metrics.total_requests += 1
-        if is_error:
-            metrics.window_errors += 1
-            metrics.total_errors += 1
+        metrics.window_requests += requests
+        metrics.total_requests += requests
+        metrics.window_errors += errors
+        metrics.total_errors += errors
         metrics.last_rate_update = now
 
         # Save updated metrics
@@ -390,7 +450,8 @@ class AbuseDetector:
     ) -> None:
         """Apply a soft block to an API key."""
         block_key = f"{self.PREFIX_BLOCK}{api_key_id}"
-        blocked_until = time.time() + self._block_duration
+        now = time.time()
+        blocked_until = now + self._block_duration
 
         await self._redis.hset(block_key, mapping={
             "until": str(blocked_until),
@@ -398,14 +459,14 @@ class AbuseDetector:
             "score": str(score),
             "rate": str(rate),
             "error_rate": str(error_rate),
-            "blocked_at": str(time.time()),
+            "blocked_at": str(now),
         })
         await self._redis.expire(block_key, self._block_duration + 60)
 
         # Record in history
         history_key = f"{self.PREFIX_HISTORY}{api_key_id}"
         await self._redis.zadd(history_key, {
-            f"{reason}:{time.time()}": time.time()
+            f"{reason}:{now}": now
         })
 
         logger.info(
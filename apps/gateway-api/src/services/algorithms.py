@@ -779,6 +779,20 @@ class ConsistentHash:
         """Hash a key to a position on the ring."""
         return int(hashlib.md5(key.encode()).hexdigest(), 16)
 
+    def copy(self) -> "ConsistentHash":
+        """
+        Return an independent copy of the ring.
+
+        Copies the existing ring structures instead of re-hashing every
+        virtual node, so callers can mutate the copy and swap it in while
+        readers keep using the original.
+        """
+        clone = ConsistentHash(virtual_nodes=self._virtual_nodes)
+        clone._ring = dict(self._ring)
+        clone._sorted_keys = list(self._sorted_keys)
+        clone._nodes = set(self._nodes)
+        return clone
+
     def add_node(self, node: str) -> None:
         """Add a node to the ring with virtual nodes."""
         if node in self._nodes:
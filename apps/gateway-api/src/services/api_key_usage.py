@@ -0,0 +1,78 @@
+"""Batched last_used_at updates for API keys."""
+
+import asyncio
+import contextlib
+from datetime import datetime, timezone
+
+import structlog
+from sqlalchemy import update
+
+from src.config import get_settings
+from src.database import get_db_context
+from src.models import ApiKey
+
+logger = structlog.get_logger(__name__)
+
+
+class ApiKeyUsageTracker:
+    """
+    Collects the IDs of API keys used by the gateway and stamps their
+    last_used_at in one UPDATE per flush interval, keeping the write off
+    the request path.
+    """
+
+    def __init__(self) -> None:
+        self._used: set[str] = set()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the periodic flush on the running event loop."""
+        if self._task is not None:
+            return
+        interval = get_settings().api_key_usage_flush_seconds
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop the flush task and write whatever is still pending."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        await self.flush()
+
+    async def touch(self, api_key_id: str) -> None:
+        """
+        Mark an API key as used.
+
+        Without a running flush task (the app was used outside its
+        lifespan) the timestamp is written immediately instead.
+        """
+        self._used.add(api_key_id)
+        if self._task is None:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Stamp last_used_at on every key used since the previous flush."""
+        if not self._used:
+            return
+        used, self._used = self._used, set()
+        async with get_db_context() as db:
+            await db.execute(
+                update(ApiKey)
+                .where(ApiKey.id.in_(used))
+                .values(last_used_at=datetime.now(timezone.utc))
+            )
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to update API key last_used_at")
+
+
+# Global instance
+api_key_usage = ApiKeyUsageTracker()
@@ -16,7 +16,7 @@ import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import urlencode
 
 import structlog
 
@@ -24,6 +24,10 @@ from src.services.redis_client import RedisClient, redis_client
 
 logger = structlog.get_logger(__name__)
 
+# Part of every hashed cache key; bump it when the stored entry layout
+# changes so entries written in the old layout are never read back
+CACHE_FORMAT_VERSION = "2"
+
 
 class CacheEntryStatus(str, Enum):
     """Status of a cache entry."""
@@ -113,6 +117,8 @@ class CacheKeyBuilder:
         query_params: dict[str, list[str]] | None = None,
         vary_headers: dict[str, str] | None = None,
         tenant_id: str | None = None,
+        query_items: list[tuple[str, str]] | None = None,
+        vary_key: str | None = None,
     ) -> str:
         """
         Build a canonical cache key.
@@ -124,29 +130,26 @@ class CacheKeyBuilder:
             query_params: Query parameters dict (param -> [values])
             vary_headers: Headers to include in cache key (header -> value)
             tenant_id: Tenant ID for isolation
+            query_items: Query parameters as (param, value) pairs, used
+                instead of query_params when given
+            vary_key: Vary component from build_vary_key, used instead of
+                vary_headers when given
         
         Returns:
             Canonical cache key string
         """
-        # Normalize query params: sort keys and values
-        normalized_query = ""
-        if query_params:
-            sorted_params = sorted(
-                (k, sorted(v)) for k, v in query_params.items()
-            )
-            normalized_query = urlencode(
-                [(k, val) for k, vals in sorted_params for val in vals],
-                doseq=False,
-            )
+        # Normalize query params: sort by key, then value
+        if query_items is None and query_params:
+            query_items = [(k, val) for k, vals in query_params.items() for val in vals]
+        normalized_query = urlencode(sorted(query_items)) if query_items else ""
 
         # Build vary key from headers
-        vary_key = ""
-        if vary_headers:
-            sorted_headers = sorted(vary_headers.items())
-            vary_key = "|".join(f"{k}:{v}" for k, v in sorted_headers)
+        if vary_key is None:
+            vary_key = CacheKeyBuilder.build_vary_key(vary_headers)
 
         # Combine components
         components = [
+            CACHE_FORMAT_VERSION,
             method.upper(),
             route_name,
             path,
@@ -163,6 +166,13 @@ class CacheKeyBuilder:
 
         return f"cache:{key_hash}"
 
+    @staticmethod
+    def build_vary_key(vary_headers: dict[str, str] | None) -> str:
+        """Build the vary component of a cache key (header -> value)."""
+        if not vary_headers:
+            return ""
+        return "|".join(f"{k}:{v}" for k, v in sorted(vary_headers.items()))
+
     @staticmethod
     def build_lock_key(cache_key: str) -> str:
         """Build a lock key for stampede protection."""
@@ -376,6 +386,7 @@ class CacheService:
         fetch_fn: Any,  # Callable[[], Awaitable[CacheEntry]]
         ttl_seconds: int = 300,
         stale_seconds: int = 60,
+        refresh_fn: Any = None,  # Callable[[], Awaitable[CacheEntry]]
     ) -> tuple[CacheEntry, CacheEntryStatus]:
         """
         Get from cache or fetch from upstream with full protection.
@@ -391,6 +402,8 @@ class CacheService:
             fetch_fn: Async function to fetch fresh data
             ttl_seconds: Cache TTL
             stale_seconds: SWR window
+            refresh_fn: Async function used for background refreshes of
+                stale entries, when it must differ from fetch_fn
         
         Returns:
             Tuple of (CacheEntry, CacheEntryStatus)
@@ -405,7 +418,9 @@ class CacheService:
             # Trigger background refresh if we get the lock
             if await self.acquire_refresh_lock(cache_key, timeout=10):
                 asyncio.create_task(
-                    self._background_refresh(cache_key, fetch_fn, ttl_seconds, stale_seconds)
+                    self._background_refresh(
+                        cache_key, refresh_fn or fetch_fn, ttl_seconds, stale_seconds
+                    )
                 )
             return cache_result.entry, CacheEntryStatus.STALE  # type: ignore
 
@@ -490,18 +505,28 @@ class CacheMetrics:
 
     @property
     def hit_rate(self) -> float:
-        total = self.hits + self.misses + self.stale_hits
-        if total == 0:
-            return 0.0
-        return (self.hits + self.stale_hits) / total
+        return self.snapshot()[4]
+
+    def snapshot(self) -> tuple[int, int, int, int, float]:
+        """
+        Read hits, misses, stale hits, errors and the hit rate in one pass.
+
+        Counters only change on the event loop thread, so a synchronous
+        read is already consistent and needs no lock.
+        """
+        hits, misses, stale_hits = self.hits, self.misses, self.stale_hits
+        total = hits + misses + stale_hits
+        hit_rate = (hits + stale_hits) / total if total else 0.0
+        return hits, misses, stale_hits, self.errors, hit_rate
 
     def to_dict(self) -> dict[str, Any]:
+        hits, misses, stale_hits, errors, hit_rate = self.snapshot()
         return {
-            "hits": self.hits,
-            "misses": self.misses,
-            "stale_hits": self.stale_hits,
-            "errors": self.errors,
-            "hit_rate": self.hit_rate,
+            "hits": hits,
+            "misses": misses,
+            "stale_hits": stale_hits,
+            "errors": errors,
+            "hit_rate": hit_rate,
         }
 
 
@@ -11,6 +11,7 @@ Both support per-key, per-route rate limits with Redis persistence.
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime
 
 import structlog
 
@@ -19,7 +20,7 @@ from src.services.redis_client import RedisClient, redis_client
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitResult:
     """Result of a rate limit check."""
 
@@ -362,22 +363,45 @@ class QuotaManager:
     Quotas are tracked in Redis with automatic expiration.
     """
 
+    # Lua script for atomic quota check and increment
+    QUOTA_SCRIPT = """
+    local daily_limit = tonumber(ARGV[1])
+    local monthly_limit = tonumber(ARGV[2])
+
+    -- Check limits before counting the request
+    local daily_usage = tonumber(redis.call('GET', KEYS[1]) or '0')
+    if daily_limit > 0 and daily_usage >= daily_limit then
+        return {0, 'daily'}
+    end
+
+    local monthly_usage = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if monthly_limit > 0 and monthly_usage >= monthly_limit then
+        return {0, 'monthly'}
+    end
+
+    -- Increment counters, setting expiration on new keys
+    if redis.call('INCR', KEYS[1]) == 1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+    end
+    if redis.call('INCR', KEYS[2]) == 1 then
+        redis.call('EXPIRE', KEYS[2], ARGV[4])
+    end
+
+    return {1, ''}
+    """
+
     def __init__(self, redis: RedisClient | None = None) -> None:
         self._redis = redis or redis_client
         self._prefix = "quota:"
 
-    def _get_daily_key(self, api_key_id: str) -> str:
+    def _get_daily_key(self, api_key_id: str, now: datetime | None = None) -> str:
         """Get Redis key for daily quota."""
-        from datetime import datetime
-
-        date_str = datetime.utcnow().strftime("%Y-%m-%d")
+        date_str = (now or datetime.utcnow()).strftime("%Y-%m-%d")
         return f"{self._prefix}daily:{api_key_id}:{date_str}"
 
-    def _get_monthly_key(self, api_key_id: str) -> str:
+    def _get_monthly_key(self, api_key_id: str, now: datetime | None = None) -> str:
         """Get Redis key for monthly quota."""
-        from datetime import datetime
-
-        month_str = datetime.utcnow().strftime("%Y-%m")
+        month_str = (now or datetime.utcnow()).strftime("%Y-%m")
         return f"{self._prefix}monthly:{api_key_id}:{month_str}"
 
     async def check_and_increment(
@@ -397,9 +421,36 @@ class QuotaManager:
         Returns:
             Tuple of (allowed, reason if not allowed)
         """
-        daily_key = self._get_daily_key(api_key_id)
-        monthly_key = self._get_monthly_key(api_key_id)
+        # One clock read keeps both keys in the same period at midnight
+        now = datetime.utcnow()
+        daily_key = self._get_daily_key(api_key_id, now)
+        monthly_key = self._get_monthly_key(api_key_id, now)
+
+        try:
+            # Check and increment both counters in one atomic round trip
+            allowed, exceeded = await self._redis.eval(
+                self.QUOTA_SCRIPT,
+                keys=[daily_key, monthly_key],
+                args=[daily_limit, monthly_limit, 86400, 31 * 86400],
+            )
+        except NotImplementedError:
+            # Fallback for demo mode (no Lua)
+            return await self._check_and_increment_fallback(
+                daily_key, monthly_key, daily_limit, monthly_limit
+            )
+
+        if not allowed:
+            return False, f"{exceeded}_quota_exceeded"
+        return True, None
 
+    async def _check_and_increment_fallback(
+        self,
+        daily_key: str,
+        monthly_key: str,
+        daily_limit: int,
+        monthly_limit: int,
+    ) -> tuple[bool, str | None]:
+        """Non-atomic fallback for demo mode."""
         # Get current usage
         daily_usage = int(await self._redis.get(daily_key) or 0)
         monthly_usage = int(await self._redis.get(monthly_key) or 0)
@@ -429,8 +480,9 @@ class QuotaManager:
 
     async def get_usage(self, api_key_id: str) -> dict[str, int]:
         """Get current quota usage."""
-        daily_key = self._get_daily_key(api_key_id)
-        monthly_key = self._get_monthly_key(api_key_id)
+        now = datetime.utcnow()
+        daily_key = self._get_daily_key(api_key_id, now)
+        monthly_key = self._get_monthly_key(api_key_id, now)
 
         daily = int(await self._redis.get(daily_key) or 0)
         monthly = int(await self._redis.get(monthly_key) or 0)
@@ -465,11 +517,16 @@ class RateLimitMetrics:
     def record_quota_exceeded(self) -> None:
         self.quota_exceeded += 1
 
+    def snapshot(self) -> tuple[int, int, int]:
+        """Read allowed, denied and quota-exceeded counts in one pass."""
+        return self.allowed, self.denied, self.quota_exceeded
+
     def to_dict(self) -> dict[str, int]:
+        allowed, denied, quota_exceeded = self.snapshot()
         return {
-            "allowed": self.allowed,
-            "denied": self.denied,
-            "quota_exceeded": self.quota_exceeded,
+            "allowed": allowed,
+            "denied": denied,
+            "quota_exceeded": quota_exceeded,
         }
 
 
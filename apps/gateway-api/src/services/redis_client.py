@@ -24,6 +24,7 @@ class RedisClient:
     _in_memory: dict[str, Any] = {}
     _in_memory_expiry: dict[str, float] = {}
     _locks: dict[str, asyncio.Lock] = {}
+    _scripts: dict[str, Any] = {}
 
     def __new__(cls) -> "RedisClient":
         """Singleton pattern for Redis client."""
@@ -63,6 +64,7 @@ class RedisClient:
         if self._redis:
             await self._redis.close()
             self._redis = None
+            self._scripts.clear()
 
     async def get(self, key: str) -> str | None:
         """Get a value from Redis or in-memory cache."""
@@ -248,9 +250,18 @@ class RedisClient:
         return 1 if offset in self._in_memory[name] else 0
 
     async def eval(self, script: str, keys: list[str], args: list[Any]) -> Any:
-        """Execute a Lua script."""
+        """
+        Execute a Lua script.
+
+        Scripts are registered once per connection and run by SHA with
+        EVALSHA, so the script body is only sent again if the server has
+        dropped it (redis-py reloads it on NOSCRIPT).
+        """
         if self._redis:
-            return await self._redis.eval(script, len(keys), *keys, *args)
+            registered = self._scripts.get(script)
+            if registered is None:
+                registered = self._scripts[script] = self._redis.register_script(script)
+            return await registered(keys=keys, args=args)
 
         # Demo mode - can't execute Lua scripts
         raise NotImplementedError("Lua scripts not supported in demo mode")
@@ -0,0 +1,155 @@
+"""Batched writer for gateway request logs."""
+
+import asyncio
+import contextlib
+from typing import Any
+
+import structlog
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import get_settings
+from src.database import get_db_context
+from src.models import RequestLog, RequestLogRollup
+from src.models.request_log import CacheStatus, ErrorType
+
+logger = structlog.get_logger(__name__)
+
+_ROLLUP_COUNTERS = (
+    "request_count",
+    "error_count",
+    "hit_count",
+    "miss_count",
+    "stale_count",
+    "latency_sum_ms",
+)
+
+
+class RequestLogWriter:
+    """
+    Buffers request log rows and writes them to the database in batches.
+
+    The gateway enqueues one row per request; a single writer task drains
+    the queue and inserts up to batch_size rows, plus their per-minute
+    rollup upserts, in one transaction. When the queue is full new rows are
+    dropped so a slow database never backs up into request handling.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        self._batch_size = 1
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self._task is not None:
+            return
+        settings = get_settings()
+        self._batch_size = settings.request_log_batch_size
+        self._queue = asyncio.Queue(maxsize=settings.request_log_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued rows and stop the writer task."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._queue = None
+
+    async def enqueue(self, row: dict[str, Any]) -> None:
+        """
+        Queue a RequestLog row for writing.
+
+        Without a running writer (the app was used outside its lifespan) the
+        row is written on its own instead.
+        """
+        if self._queue is None:
+            await self._write([row])
+            return
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Request log queue full, dropping row", dropped=self.dropped)
+
+    async def _run(self) -> None:
+        """Drain the queue, writing whatever has accumulated as one batch."""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write(batch)
+            except Exception:
+                logger.exception("Failed to write request logs", rows=len(batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        async with get_db_context() as db:
+            db.add_all([RequestLog(**row) for row in rows])
+            await _record_rollups(db, rows)
+
+
+def _rollup_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Aggregate logged requests into per-minute rollup rows.
+
+    Each bucket appears once, since Postgres rejects an upsert that touches
+    the same row twice. Buckets are sorted so that concurrent writers lock
+    overlapping rollup rows in the same order, which avoids deadlocks.
+    """
+    buckets: dict[tuple, dict[str, Any]] = {}
+    for row in rows:
+        minute = row["timestamp"].replace(second=0, microsecond=0)
+        key = (minute, row["route_id"], row["api_key_id"])
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = {
+                "minute": minute,
+                "route_id": row["route_id"],
+                "api_key_id": row["api_key_id"],
+                **dict.fromkeys(_ROLLUP_COUNTERS, 0),
+            }
+        bucket["request_count"] += 1
+        bucket["error_count"] += row["error_type"] != ErrorType.NONE
+        bucket["hit_count"] += row["cache_status"] == CacheStatus.HIT
+        bucket["miss_count"] += row["cache_status"] == CacheStatus.MISS
+        bucket["stale_count"] += row["cache_status"] == CacheStatus.STALE
+        bucket["latency_sum_ms"] += row["latency_ms"]
+
+    # Route and key IDs may be null, so compare them as strings
+    return [
+        bucket
+        for _, bucket in sorted(
+            buckets.items(),
+            key=lambda item: (item[0][0], str(item[0][1] or ""), str(item[0][2] or "")),
+        )
+    ]
+
+
+async def _record_rollups(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Add logged requests to their per-minute analytics rollup buckets."""
+    # Both dialects share the ON CONFLICT API; SQLite backs the test suite
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(RequestLogRollup).values(_rollup_rows(rows))
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["minute", "route_id", "api_key_id"],
+            set_={
+                name: getattr(RequestLogRollup, name) + getattr(stmt.excluded, name)
+                for name in _ROLLUP_COUNTERS
+            },
+        )
+    )
+
+
+# Global instance
+request_log_writer = RequestLogWriter()
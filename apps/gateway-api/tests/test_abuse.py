@@ -141,3 +141,28 @@ class TestAbuseDetector:
         
         # The spike detection happens on window rollover
         # This is a simplified test - full integration would need time simulation
+
+    @pytest.mark.asyncio
+    async def test_tracked_requests_flushed_per_key(self, detector: AbuseDetector):
+        """Tracked requests are counted in memory and recorded together on flush."""
+        detector.start()
+        for i in range(5):
+            await detector.track_request("batched-key", is_error=i < 2)
+
+        metrics_key = f"{detector.PREFIX_METRICS}batched-key"
+        assert await detector._redis.hgetall(metrics_key) == {}
+
+        await detector.stop()
+
+        metrics = await detector._load_metrics(metrics_key)
+        assert metrics.total_requests == 5
+        assert metrics.total_errors == 2
+
+    @pytest.mark.asyncio
+    async def test_track_records_directly_when_not_started(self, detector: AbuseDetector):
+        """Without a flush task each tracked request is recorded immediately."""
+        await detector.track_request("direct-key", is_error=True)
+
+        metrics = await detector._load_metrics(f"{detector.PREFIX_METRICS}direct-key")
+        assert metrics.total_requests == 1
+        assert metrics.total_errors == 1
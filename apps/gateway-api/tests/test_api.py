@@ -1,8 +1,15 @@
 """Integration tests for API endpoints."""
 
+import base64
+from datetime import datetime, timezone
+from uuid import uuid4
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
 
+from src.api.admin import _decode_log_cursor, _encode_log_cursor
+
 
 class TestHealthEndpoints:
     """Tests for health and metrics endpoints."""
@@ -146,6 +153,36 @@ class TestAdminEndpoints:
         assert "cache_hit_rate" in data
 
 
+class TestLogCursor:
+    """Tests for request log pagination cursors."""
+
+    def test_round_trip(self):
+        """A cursor decodes to the sort key it was built from."""
+        timestamp = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+        log_id = str(uuid4())
+
+        cursor = _encode_log_cursor(timestamp, log_id)
+
+        assert _decode_log_cursor(cursor) == (timestamp, log_id)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "not-a-cursor",
+            "!!!",
+            base64.urlsafe_b64encode(b"no-separator").decode(),
+            base64.urlsafe_b64encode(b"yesterday|" + str(uuid4()).encode()).decode(),
+            base64.urlsafe_b64encode(b"2024-01-01T00:00:00|not-a-uuid").decode(),
+        ],
+    )
+    def test_invalid_cursor_rejected(self, cursor: str):
+        """Malformed, undecodable or wrongly shaped cursors are a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_log_cursor(cursor)
+
+        assert exc_info.value.status_code == 400
+
+
 class TestGatewayEndpoints:
     """Tests for gateway proxy endpoints."""
 
@@ -73,6 +73,26 @@ class TestCacheKeyBuilder:
         
         assert key1 != key2
 
+    def test_prebuilt_vary_key_matches_headers(self):
+        """A vary key built up front yields the same cache key."""
+        vary_headers = {"accept": "application/json", "accept-language": "en"}
+
+        key1 = CacheKeyBuilder.build(
+            method="GET",
+            route_name="api",
+            path="/items",
+            vary_headers=vary_headers,
+        )
+
+        key2 = CacheKeyBuilder.build(
+            method="GET",
+            route_name="api",
+            path="/items",
+            vary_key=CacheKeyBuilder.build_vary_key(vary_headers),
+        )
+
+        assert key1 == key2
+
     def test_method_affects_key(self):
         """Different methods should have different keys."""
         key_get = CacheKeyBuilder.build(method="GET", route_name="api", path="/items")
@@ -1,19 +1,23 @@
 """Tests for gateway proxy behavior."""
 
+import gzip
+
 import httpx
 import pytest
 from starlette.requests import Request
+from starlette.responses import StreamingResponse
 
 from src.gateway.proxy import GatewayProxy
 from src.gateway.router import AuthResult, GatewayContext, RouteMatch
 from src.models import CachePolicy, Route
 from src.models.request_log import CacheStatus, ErrorType
+from src.services.cache import CacheEntryStatus
 
 
-def _make_request() -> Request:
+def _make_request(method: str = "GET") -> Request:
     scope = {
         "type": "http",
-        "method": "GET",
+        "method": method,
         "path": "/g/test/resource",
         "headers": [],
         "query_string": b"",
@@ -22,6 +26,10 @@ def _make_request() -> Request:
     return Request(scope)
 
 
+async def _read_streamed(response: StreamingResponse) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
 @pytest.mark.asyncio
 async def test_proxy_bypasses_cache_for_non_cacheable_status():
     request_count = 0
@@ -67,6 +75,356 @@ async def test_proxy_bypasses_cache_for_non_cacheable_status():
     await proxy.close()
 
     assert result.response.status_code == 500
+    assert result.response.body == b'{"error":"upstream"}'
     assert result.cache_status == CacheStatus.BYPASS
     assert result.error_type == ErrorType.NONE
     assert request_count == 1
+
+
+@pytest.mark.asyncio
+async def test_head_served_from_get_cache_entry():
+    methods: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        return httpx.Response(200, content=b"hello")
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="head-test",
+        path_pattern="/{path:path}",
+        methods=["GET", "HEAD"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route),
+    )
+
+    get_result = await proxy.proxy_request(_make_request(), context, "/resource")
+    head_result = await proxy.proxy_request(_make_request("HEAD"), context, "/resource")
+
+    await proxy.close()
+
+    assert methods == ["GET"]
+    assert get_result.response.body == b"hello"
+    assert head_result.cache_status == CacheStatus.HIT
+    assert head_result.response.body == b""
+    assert head_result.response.headers["content-length"] == "5"
+    assert head_result.response_size_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_bypass_response_drops_upstream_framing_headers():
+    body = b'{"error": "upstream"}' * 10
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            500,
+            content=gzip.compress(body),
+            headers={"Content-Encoding": "gzip", "X-Upstream": "yes"},
+        )
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="framing-test",
+        path_pattern="/{path:path}",
+        methods=["GET"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    policy = CachePolicy(name="cache-200-only", cacheable_statuses_json=[200], max_body_bytes=1024)
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route, policy=policy),
+    )
+
+    result = await proxy.proxy_request(_make_request(), context, "/resource")
+
+    await proxy.close()
+
+    # httpx decoded the body, so the headers must describe the decoded bytes
+    assert result.response.body == body
+    assert "content-encoding" not in result.response.headers
+    assert result.response.headers["content-length"] == str(len(body))
+    assert result.response.headers["x-upstream"] == "yes"
+
+
+@pytest.mark.asyncio
+async def test_no_store_route_streams_request_body():
+    received: list[tuple[str, bytes]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        received.append((request.method, await request.aread()))
+        return httpx.Response(201)
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="stream-test",
+        path_pattern="/{path:path}",
+        methods=["POST"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    policy = CachePolicy(name="no-store", cache_no_store=True)
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route, policy=policy),
+    )
+
+    chunks = [b'{"name": ', b'"widget"}']
+
+    async def receive() -> dict:
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    request = Request(_make_request("POST").scope, receive)
+    result = await proxy.proxy_request(request, context, "/resource")
+
+    await proxy.close()
+
+    assert result.response.status_code == 201
+    assert received == [("POST", b'{"name": "widget"}')]
+    # The body went upstream without being buffered on the request
+    assert not hasattr(request, "_body")
+
+
+@pytest.mark.asyncio
+async def test_route_header_transformations_applied():
+    sent: list[list[tuple[str, str]]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers.multi_items())
+        return httpx.Response(200)
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="headers-test",
+        path_pattern="/{path:path}",
+        methods=["GET"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={"X-Tenant": "gateway"},
+        request_headers_remove=["X-Secret"],
+        response_headers_add={},
+    )
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route),
+    )
+
+    request = _make_request()
+    request.scope["headers"] = [
+        (b"host", b"gateway.test"),
+        (b"x-secret", b"hunter2"),
+        (b"x-tenant", b"spoofed"),
+        (b"accept", b"text/html"),
+        (b"accept", b"application/json"),
+    ]
+    await proxy.proxy_request(request, context, "/resource")
+
+    await proxy.close()
+
+    headers = [(k, v) for k, v in sent[0] if k in ("x-secret", "x-tenant", "accept")]
+    assert headers == [
+        ("accept", "text/html"),
+        ("accept", "application/json"),
+        ("x-tenant", "gateway"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_entry_stores_filtered_headers():
+    body = b"hello " * 50
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=gzip.compress(body),
+            headers={"Content-Encoding": "gzip", "Age": "7", "X-Upstream": "yes"},
+        )
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="entry-headers-test",
+        path_pattern="/{path:path}",
+        methods=["GET"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route),
+    )
+
+    entry = await proxy._fetch_and_build_entry(_make_request(), context, "/resource", None)
+    await proxy.close()
+
+    assert "content-encoding" not in entry.headers
+    assert "content-length" not in entry.headers
+
+    response = proxy._build_response(entry, CacheEntryStatus.MISS)
+    assert response.body == body
+    assert response.headers.getlist("age") == ["0"]
+    assert response.headers["content-length"] == str(len(body))
+    assert response.headers["x-cache"] == "HIT"
+    assert response.headers["x-upstream"] == "yes"
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_streamed_not_cached():
+    body = b"".join(bytes([i]) * 1000 for i in range(5))
+    request_count = 0
+
+    async def chunks():
+        for i in range(0, len(body), 1000):
+            yield body[i:i + 1000]
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        nonlocal request_count
+        request_count += 1
+        return httpx.Response(200, content=chunks())
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="oversized-test",
+        path_pattern="/{path:path}",
+        methods=["GET"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    policy = CachePolicy(name="small", cacheable_statuses_json=[200], max_body_bytes=1024)
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route, policy=policy),
+    )
+
+    first = await proxy.proxy_request(_make_request(), context, "/resource")
+    first_body = await _read_streamed(first.response)
+    second = await proxy.proxy_request(_make_request(), context, "/resource")
+    second_body = await _read_streamed(second.response)
+
+    await proxy.close()
+
+    assert first_body == body and second_body == body
+    assert first.cache_status == CacheStatus.BYPASS
+    assert first.response_size_bytes is None
+    assert request_count == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_uncacheable_status_streamed():
+    body = b"".join(bytes([i]) * 1000 for i in range(5))
+    read = 0
+
+    async def chunks():
+        nonlocal read
+        for i in range(0, len(body), 1000):
+            read += 1000
+            yield body[i:i + 1000]
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, content=chunks())
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="oversized-error-test",
+        path_pattern="/{path:path}",
+        methods=["GET"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    policy = CachePolicy(name="small", cacheable_statuses_json=[200], max_body_bytes=1024)
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route, policy=policy),
+    )
+
+    result = await proxy.proxy_request(_make_request(), context, "/resource")
+    read_before_streaming = read
+    streamed = await _read_streamed(result.response)
+
+    await proxy.close()
+
+    assert isinstance(result.response, StreamingResponse)
+    assert result.response.status_code == 500
+    assert result.cache_status == CacheStatus.BYPASS
+    assert read_before_streaming < len(body)
+    assert streamed == body
+
+
+@pytest.mark.asyncio
+async def test_head_on_no_store_route_releases_upstream_body():
+    closed = False
+
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"hello"
+
+        async def aclose(self) -> None:
+            nonlocal closed
+            closed = True
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=Body(), headers={"X-Upstream": "yes"})
+
+    proxy = GatewayProxy(timeout_ms=1000)
+    proxy._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    route = Route(
+        name="head-no-store-test",
+        path_pattern="/{path:path}",
+        methods=["GET", "HEAD"],
+        upstream_base_url="http://upstream.test",
+        timeout_ms=1000,
+        request_headers_add={},
+        request_headers_remove=[],
+        response_headers_add={},
+    )
+    policy = CachePolicy(name="no-store", cache_no_store=True)
+    context = GatewayContext(
+        auth=AuthResult(authenticated=True),
+        route_match=RouteMatch(matched=True, route=route, policy=policy),
+    )
+
+    result = await proxy.proxy_request(_make_request("HEAD"), context, "/resource")
+
+    await proxy.close()
+
+    assert result.response.body == b""
+    assert result.response.headers["x-upstream"] == "yes"
+    assert result.response_size_bytes == 0
+    assert closed
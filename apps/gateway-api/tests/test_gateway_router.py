@@ -0,0 +1,184 @@
+"""Tests for gateway authentication and route matching."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.gateway.router import GatewayRouter
+from src.models import ApiKey, Route, Tenant
+from src.models.api_key import ApiKeyStatus
+
+
+def make_db(route: Route | None) -> AsyncMock:
+    """Session stub whose route query returns the given row."""
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = route
+    db = AsyncMock()
+    db.execute.return_value = result
+    return db
+
+
+def make_route(name: str) -> Route:
+    return Route(name=name, methods=["GET"], upstream_base_url="http://localhost:8001")
+
+
+class TestRouteCache:
+    """Tests for the route cache and the negative cache of unknown names."""
+
+    async def test_matched_route_skips_query(self):
+        """A route that matched once is reused without another query."""
+        router = GatewayRouter()
+        db = make_db(make_route("products"))
+
+        first = await router.match_route(db, "products", "GET", None)
+        second = await router.match_route(db, "products", "GET", None)
+
+        assert first.matched and second.matched
+        assert second.route is first.route
+        assert db.execute.await_count == 1
+
+    async def test_cached_route_detached_from_model(self):
+        """The cache holds a snapshot that later changes to the row cannot reach."""
+        router = GatewayRouter()
+        route = make_route("products")
+        db = make_db(route)
+
+        await router.match_route(db, "products", "GET", None)
+        route.methods = ["POST"]
+        route.upstream_base_url = "http://elsewhere"
+        match = await router.match_route(db, "products", "GET", None)
+
+        assert match.matched
+        assert not isinstance(match.route, Route)
+        assert match.route.get_upstream_url("/items") == "http://localhost:8001/items"
+
+    async def test_unknown_route_skips_query(self):
+        """A name that matched nothing is answered without another query."""
+        router = GatewayRouter()
+        db = make_db(None)
+
+        first = await router.match_route(db, "products", "GET", None)
+        second = await router.match_route(db, "products", "GET", None)
+
+        assert not first.matched and not second.matched
+        assert second.error == "Route 'products' not found"
+        assert db.execute.await_count == 1
+
+    async def test_forgotten_route_queried_again(self):
+        """Forgetting a name makes the next lookup hit the database."""
+        router = GatewayRouter()
+        await router.match_route(make_db(None), "products", "GET", None)
+
+        router.forget_routes()
+        match = await router.match_route(make_db(make_route("products")), "products", "GET", None)
+
+        assert match.matched
+        assert match.route.name == "products"
+
+    async def test_method_mismatch_keeps_route(self):
+        """A method the route does not take still caches the route itself."""
+        router = GatewayRouter()
+        db = make_db(make_route("products"))
+
+        post = await router.match_route(db, "products", "POST", None)
+        get = await router.match_route(db, "products", "GET", None)
+
+        assert post.error == "Route 'products' does not support method POST"
+        assert get.matched
+        assert db.execute.await_count == 1
+
+    async def test_other_tenants_route_not_matched(self):
+        """A tenant-specific route is only matched for its own tenant."""
+        router = GatewayRouter()
+        route = make_route("products")
+        route.tenant_id = "tenant-1"
+        db = make_db(route)
+
+        assert (await router.match_route(db, "products", "GET", "tenant-1")).matched
+        assert not (await router.match_route(db, "products", "GET", "tenant-2")).matched
+
+
+def make_auth_db(api_key: ApiKey | None) -> AsyncMock:
+    """Session stub that finds the given key and no active block rule."""
+
+    async def execute(query):
+        await asyncio.sleep(0)
+        result = MagicMock()
+        result.first.return_value = api_key and SimpleNamespace(
+            id=api_key.id,
+            key=api_key.key,
+            status=api_key.status,
+            expires_at=api_key.expires_at,
+            tenant_id=api_key.tenant.id,
+            quota_daily=api_key.quota_daily,
+            quota_monthly=api_key.quota_monthly,
+            rate_limit_rps=api_key.rate_limit_rps,
+            rate_limit_burst=api_key.rate_limit_burst,
+            tenant_active=api_key.tenant.is_active,
+            block_id=None,
+            block_reason=None,
+        )
+        return result
+
+    return AsyncMock(execute=AsyncMock(side_effect=execute))
+
+
+@pytest.fixture
+def api_key(monkeypatch) -> ApiKey:
+    monkeypatch.setattr("src.gateway.router.api_key_usage.touch", AsyncMock())
+    return ApiKey(
+        id="key-1",
+        key="hx_test",
+        status=ApiKeyStatus.ACTIVE,
+        tenant=Tenant(id="tenant-1", name="Tenant", is_active=True),
+    )
+
+
+class TestAuthCache:
+    """Tests for the authenticated API key cache."""
+
+    async def test_authenticated_key_cached(self, api_key: ApiKey):
+        """A successful authentication is reused without querying again."""
+        router = GatewayRouter()
+        db = make_auth_db(api_key)
+
+        first = await router.authenticate(db, "hx_test")
+        second = await router.authenticate(db, "hx_test")
+
+        assert first.authenticated and second.authenticated
+        assert second.api_key.id == api_key.id
+        assert second.tenant_id == "tenant-1"
+        assert db.execute.await_count == 1
+
+    async def test_concurrent_lookups_coalesced(self, api_key: ApiKey):
+        """Concurrent requests for an uncached key share one lookup."""
+        router = GatewayRouter()
+        db = make_auth_db(api_key)
+
+        results = await asyncio.gather(*(router.authenticate(db, "hx_test") for _ in range(5)))
+
+        assert all(auth.authenticated for auth in results)
+        assert db.execute.await_count == 1
+
+    async def test_invalid_key_not_cached(self):
+        """Failed authentications are looked up again next time."""
+        router = GatewayRouter()
+        db = make_auth_db(None)
+
+        assert (await router.authenticate(db, "hx_bogus")).error_code == "invalid_api_key"
+        assert (await router.authenticate(db, "hx_bogus")).error_code == "invalid_api_key"
+        assert db.execute.await_count == 2
+
+    async def test_forget_api_keys(self, api_key: ApiKey):
+        """Clearing the cache makes the next request query again."""
+        router = GatewayRouter()
+        db = make_auth_db(api_key)
+
+        await router.authenticate(db, "hx_test")
+        router.forget_api_keys()
+        api_key.status = ApiKeyStatus.REVOKED
+
+        auth = await router.authenticate(db, "hx_test")
+        assert auth.error_code == "key_inactive"
@@ -0,0 +1,68 @@
+"""Tests for gateway middleware helpers."""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.middleware.logging import LoggingMiddleware, _orjson_dumps, get_client_ip
+
+
+def make_request(headers: list[tuple[bytes, bytes]], client=("10.0.0.1", 1234)) -> Request:
+    return Request({"type": "http", "headers": headers, "client": client})
+
+
+class TestGetClientIp:
+    """Tests for client IP resolution."""
+
+    def test_forwarded_for_first_hop(self):
+        """The first address in X-Forwarded-For is the client."""
+        request = make_request(
+            [(b"x-real-ip", b"2.2.2.2"), (b"x-forwarded-for", b"1.1.1.1, 3.3.3.3")]
+        )
+        assert get_client_ip(request) == "1.1.1.1"
+
+    def test_real_ip_when_not_forwarded(self):
+        """X-Real-IP is used when X-Forwarded-For is missing or empty."""
+        request = make_request([(b"x-forwarded-for", b""), (b"x-real-ip", b"2.2.2.2")])
+        assert get_client_ip(request) == "2.2.2.2"
+
+    def test_direct_client(self):
+        """Without proxy headers the connecting address is used."""
+        assert get_client_ip(make_request([])) == "10.0.0.1"
+        assert get_client_ip(make_request([], client=None)) == "unknown"
+
+    def test_resolved_once(self):
+        """The resolved address is kept in the request state."""
+        request = make_request([(b"x-real-ip", b"2.2.2.2")])
+        get_client_ip(request)
+        request.scope["headers"] = [(b"x-real-ip", b"9.9.9.9")]
+        assert get_client_ip(request) == "2.2.2.2"
+
+
+class TestJsonLogs:
+    """Tests for the JSON log serializer."""
+
+    def test_non_str_keys_serialized(self):
+        """Int-keyed values such as status counters do not break logging."""
+        assert _orjson_dumps({"statuses": {200: 3, 404: 1}}) == '{"statuses":{"200":3,"404":1}}'
+
+
+class TestLoggingMiddleware:
+    """Tests for LoggingMiddleware."""
+
+    def test_response_time_replaces_upstream_value(self):
+        """An X-Response-Time set by the app is replaced, not duplicated."""
+
+        async def endpoint(request: Request) -> Response:
+            return Response(headers={"X-Response-Time": "upstream"})
+
+        app = Starlette(routes=[Route("/", endpoint)])
+        app.add_middleware(LoggingMiddleware)
+
+        response = TestClient(app).get("/")
+
+        values = response.headers.get_list("x-response-time")
+        assert len(values) == 1
+        assert values[0] != "upstream" and values[0].endswith("ms")
@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -213,3 +214,17 @@ class TestQuotaManager:
         
         assert usage["daily_usage"] == 5
         assert usage["monthly_usage"] == 5
+
+    @pytest.mark.asyncio
+    async def test_script_result_mapped_to_reason(self):
+        """The exceeded period reported by the Lua script names the reason."""
+        redis = AsyncMock()
+        redis.eval.return_value = [0, "monthly"]
+        quota = QuotaManager(redis)
+
+        allowed, reason = await quota.check_and_increment("key1", daily_limit=10, monthly_limit=10)
+
+        assert allowed is False
+        assert reason == "monthly_quota_exceeded"
+        assert redis.eval.await_args.kwargs["args"][:2] == [10, 10]
+        redis.get.assert_not_awaited()
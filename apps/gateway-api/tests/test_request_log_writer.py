@@ -0,0 +1,104 @@
+"""Tests for the batched request log writer."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.config import get_settings
+from src.models.request_log import CacheStatus, ErrorType
+from src.services.request_log_writer import RequestLogWriter, _rollup_rows
+
+
+@pytest.fixture
+def writer(monkeypatch) -> tuple[RequestLogWriter, list[list[dict]]]:
+    """Writer whose database writes are captured instead of executed."""
+    writer = RequestLogWriter()
+    batches: list[list[dict]] = []
+
+    async def capture(rows: list[dict]) -> None:
+        batches.append(rows)
+
+    monkeypatch.setattr(writer, "_write", capture)
+    return writer, batches
+
+
+class TestRequestLogWriter:
+    """Tests for RequestLogWriter."""
+
+    async def test_queued_rows_written_as_one_batch(self, writer):
+        """Rows queued before the writer runs share a single write."""
+        writer, batches = writer
+        writer.start()
+
+        for i in range(5):
+            await writer.enqueue({"request_id": f"req-{i}"})
+        await writer.stop()
+
+        assert len(batches) == 1
+        assert [row["request_id"] for row in batches[0]] == [f"req-{i}" for i in range(5)]
+
+    async def test_batch_size_respected(self, writer, monkeypatch):
+        """Batches never exceed the configured size."""
+        writer, batches = writer
+        monkeypatch.setattr(get_settings(), "request_log_batch_size", 2)
+        writer.start()
+
+        for i in range(5):
+            await writer.enqueue({"request_id": f"req-{i}"})
+        await writer.stop()
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    async def test_full_queue_drops_rows(self, writer, monkeypatch):
+        """Rows beyond the queue size are dropped rather than waited on."""
+        writer, batches = writer
+        monkeypatch.setattr(get_settings(), "request_log_queue_size", 3)
+        writer.start()
+
+        for i in range(5):
+            await writer.enqueue({"request_id": f"req-{i}"})
+        await writer.stop()
+
+        assert writer.dropped == 2
+        assert sum(len(batch) for batch in batches) == 3
+
+    async def test_writes_directly_when_not_started(self, writer):
+        """Without a running writer each row is written immediately."""
+        writer, batches = writer
+
+        await writer.enqueue({"request_id": "req-1"})
+
+        assert batches == [[{"request_id": "req-1"}]]
+
+
+def make_row(second: int, route_id: str | None, api_key_id: str | None) -> dict:
+    return {
+        "timestamp": datetime(2024, 1, 1, 12, 0, second, tzinfo=timezone.utc),
+        "route_id": route_id,
+        "api_key_id": api_key_id,
+        "error_type": ErrorType.NONE,
+        "cache_status": CacheStatus.HIT,
+        "latency_ms": 5,
+    }
+
+
+class TestRollupRows:
+    """Tests for the per-minute rollup aggregation."""
+
+    def test_buckets_sorted_regardless_of_arrival(self):
+        """Overlapping batches list their buckets in the same order."""
+        rows = [
+            make_row(1, "route-b", "key-1"),
+            make_row(2, None, "key-1"),
+            make_row(3, "route-a", None),
+            make_row(4, "route-a", "key-2"),
+            make_row(5, "route-b", "key-1"),
+        ]
+
+        forward = _rollup_rows(rows)
+        backward = _rollup_rows(rows[::-1])
+
+        keys = [(bucket["route_id"], bucket["api_key_id"]) for bucket in forward]
+        assert keys == [(None, "key-1"), ("route-a", None), ("route-a", "key-2"), ("route-b", "key-1")]
+        assert [(b["route_id"], b["api_key_id"]) for b in backward] == keys
+        assert forward[-1]["request_count"] == 2
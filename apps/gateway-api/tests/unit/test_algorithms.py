@@ -15,12 +15,8 @@ import math
 import pytest
 
 # Import algorithms (these don't need Redis for basic tests)
-from src.services.algorithms import (
-    ConsistentHash,
-    ExponentialBackoff,
-    EWMACalculator,
-    ZScoreDetector,
-)
+from src.services.abuse import EWMACalculator, ZScoreDetector
+from src.services.algorithms import ConsistentHash, ExponentialBackoff
 
 
 class TestConsistentHash:
@@ -75,6 +71,23 @@ class TestConsistentHash:
         # With consistent hashing, only ~25% of keys should move to the new node
         assert changed < 40  # Allow some variance
 
+    def test_copy_is_independent(self):
+        """Test that mutating a copy leaves the original ring untouched."""
+        ch = ConsistentHash(nodes=["node-1", "node-2", "node-3"])
+        keys = [f"key-{i}" for i in range(100)]
+        mappings = {k: ch.get_node(k) for k in keys}
+        
+        clone = ch.copy()
+        assert clone.get_distribution() == ch.get_distribution()
+        assert {k: clone.get_node(k) for k in keys} == mappings
+        
+        clone.add_node("node-4")
+        clone.remove_node("node-1")
+        
+        assert "node-4" not in ch.get_distribution()
+        assert "node-1" in ch.get_distribution()
+        assert {k: ch.get_node(k) for k in keys} == mappings
+
     def test_get_multiple_nodes(self):
         """Test getting multiple nodes for replication."""
         ch = ConsistentHash(nodes=["node-1", "node-2", "node-3"])
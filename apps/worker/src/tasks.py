@@ -63,10 +63,10 @@ def aggregate_hourly_metrics():
     """
     logger.info("Running hourly metrics aggregation")
     
+    # Per-minute counters are maintained in request_log_rollups on ingest.
     # This would:
-    # 1. Query request_logs for the past hour
-    # 2. Compute aggregates (count, avg latency, cache hit rate, etc.)
-    # 3. Store in a metrics table or time-series database
+    # 1. Sum request_log_rollups minutes older than a day into hourly rows
+    # 2. Delete the compacted per-minute rows
     
     return {"status": "completed"}
 